@@ -0,0 +1,107 @@
+"""
+Benchmark - Coût de l'hydratation des lignes tasks en objets Task
+
+Compare, pour 100 000 lignes :
+- avant : boucle historique (accès par nom + 3 datetime.fromisoformat par ligne)
+- après : Repository._to_tasks avec dates ISO puis avec dates epoch
+
+Lancement (depuis la racine du projet) :
+    python -m benchmarks.bench_hydration [nombre_de_lignes]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from models.database import Database
+from models.repository import Repository, TASK_COLUMNS
+from models.task import Task
+
+ROWS = 100_000
+REPEAT = 3
+
+
+def legacy_hydration(rows):
+    """Boucle d'hydratation d'origine, recopiée telle quelle pour comparaison"""
+    tasks = []
+    for row in rows:
+        task = Task(
+            id=row['id'],
+            titre=row['titre'],
+            description=row['description'],
+            etat=row['etat'],
+            date_echeance=datetime.fromisoformat(row['date_echeance']) if row['date_echeance'] else None,
+            date_fin=datetime.fromisoformat(row['date_fin']) if row['date_fin'] else None,
+            date_creation=datetime.fromisoformat(row['date_creation'])
+        )
+        tasks.append(task)
+    return tasks
+
+
+def generate_tasks(count: int):
+    """Tâches de test : 2/3 avec échéance, 1/3 réalisées"""
+    start = datetime(2025, 1, 1, 9, 0)
+    etats = ["À faire", "En cours", "Réalisé"]
+    for i in range(count):
+        etat = etats[i % 3]
+        yield Task(
+            titre=f"Tâche {i}",
+            description="Description de test",
+            etat=etat,
+            date_creation=start + timedelta(minutes=i),
+            date_echeance=start + timedelta(days=i % 90) if i % 3 else None,
+            date_fin=start + timedelta(days=1) if etat == "Réalisé" else None
+        )
+
+
+def best_time(func, rows) -> float:
+    """Meilleur temps sur REPEAT exécutions"""
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(rows)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def fetch_rows(repository: Repository):
+    """Lit toutes les lignes (hors chronométrage de l'hydratation)"""
+    cursor = repository.database.get_connection().execute(f"SELECT {TASK_COLUMNS} FROM tasks")
+    return cursor.fetchall()
+
+
+def main(count: int = ROWS):
+    """Crée une base temporaire, mesure chaque variante et affiche le coût pour 100k lignes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"), profile="safe", date_storage="iso")
+        db.init_database()
+        repository = Repository(db)
+        repository.create_tasks_many(generate_tasks(count))
+
+        scale = 100_000 / count
+        rows = fetch_rows(repository)
+        results = [
+            ("avant  (accès par nom, ISO)", best_time(legacy_hydration, rows)),
+            ("après  (_to_tasks, ISO)", best_time(repository._to_tasks, rows)),
+        ]
+        db.get_connection().execute("VACUUM")
+        size_iso = os.path.getsize(db.db_path)
+
+        db.convert_date_storage("epoch")
+        db.get_connection().execute("VACUUM")
+        rows = fetch_rows(repository)
+        results.append(("après  (_to_tasks, epoch)", best_time(repository._to_tasks, rows)))
+        size_epoch = os.path.getsize(db.db_path)
+
+        db.close()
+
+    print(f"\n⏱️ Hydratation de {count} lignes (ramené à 100 000 lignes, meilleur de {REPEAT}) :")
+    for label, seconds in results:
+        print(f"  {label:<28} {seconds * scale * 1000:8.1f} ms")
+    print(f"\n💾 Taille de la base : ISO {size_iso / 1024:.0f} Kio, epoch {size_epoch / 1024:.0f} Kio")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS)
@@ -0,0 +1,105 @@
+"""
+Benchmark - Mémoire occupée par les tâches chargées
+
+Compare l'ancienne dataclass Task (un __dict__ par instance, validation à
+chaque construction) à la version slots=True construite par Task.from_db,
+pour 100 000 et 1 000 000 de tâches.
+
+Lancement (depuis la racine du projet) :
+    python -m benchmarks.bench_memory [nombre_de_lignes ...]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from models.task import Task
+
+SIZES = (100_000, 1_000_000)
+
+
+@dataclass
+class LegacyTask:
+    """Ancienne définition de Task (sans slots), recopiée pour comparaison"""
+    titre: str
+    description: str
+    etat: str
+    date_creation: datetime
+    date_echeance: Optional[datetime] = None
+    date_fin: Optional[datetime] = None
+    id: Optional[int] = None
+
+    def __post_init__(self):
+        etats_valides = ["À faire", "En cours", "Réalisé"]
+        if self.etat not in etats_valides:
+            raise ValueError(f"État invalide. Doit être parmi : {etats_valides}")
+
+
+def generate_rows(count: int):
+    """Lignes telles que renvoyées par la base (dates déjà décodées)"""
+    start = datetime(2025, 1, 1, 9, 0)
+    etats = ["À faire", "En cours", "Réalisé"]
+    for i in range(count):
+        etat = etats[i % 3]
+        yield (
+            i,
+            f"Tâche {i}",
+            "Description de test",
+            etat,
+            start + timedelta(days=i % 90) if i % 3 else None,
+            start + timedelta(days=1) if etat == "Réalisé" else None,
+            start + timedelta(minutes=i)
+        )
+
+
+def build_legacy(count: int):
+    """Construction historique : constructeur validé, mots-clés"""
+    return [
+        LegacyTask(id=r[0], titre=r[1], description=r[2], etat=r[3],
+                   date_echeance=r[4], date_fin=r[5], date_creation=r[6])
+        for r in generate_rows(count)
+    ]
+
+
+def build_slotted(count: int):
+    """Construction actuelle : Task slots=True via from_db (sans validation)"""
+    from_db = Task.from_db
+    return [from_db(*r) for r in generate_rows(count)]
+
+
+def measure(builder, count: int):
+    """Retourne (octets par tâche, secondes de construction) pour count tâches"""
+    # Temps de construction mesuré sans tracemalloc (qui ralentit chaque allocation)
+    gc.collect()
+    start = time.perf_counter()
+    tasks = builder(count)
+    seconds = time.perf_counter() - start
+    del tasks
+
+    gc.collect()
+    tracemalloc.start()
+    tasks = builder(count)
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    gc.collect()
+    return current / count, seconds
+
+
+def main(sizes=SIZES):
+    """Affiche octets/tâche et temps de construction pour chaque taille"""
+    print("\n💾 Mémoire par tâche (total = objet + chaînes + dates + place dans la liste) :")
+    for count in sizes:
+        for label, builder in (("dataclass + __dict__", build_legacy),
+                               ("slots + from_db", build_slotted)):
+            per_task, seconds = measure(builder, count)
+            print(f"  {count:>9} tâches  {label:<22} {per_task:4.0f} octets/tâche "
+                  f"({per_task * count / 1024 / 1024:6.1f} Mio), construction {seconds:.2f} s")
+
+
+if __name__ == "__main__":
+    main(tuple(int(arg) for arg in sys.argv[1:]) or SIZES)
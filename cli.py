@@ -0,0 +1,172 @@
+"""
+cli.py - Outils en ligne de commande (sans interface graphique)
+
+Exemples :
+    python cli.py import taches.csv
+    python cli.py import commentaires.jsonl --type comments
+    python cli.py export sauvegarde.jsonl
+    python cli.py convert-dates epoch
+    python cli.py check-comments --fix
+    python cli.py archive --days 90
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+
+from models.database import Database
+from models.repository import Repository, ARCHIVE_BATCH_SIZE
+from controllers.import_controller import ImportController, FORMATS
+from controllers.export_controller import ExportController
+from controllers.comment_controller import CommentController
+from controllers.task_controller import TaskController
+from models.date_storage import DATE_STORAGES
+
+
+def cmd_import(repository: Repository, args) -> int:
+    """Importe des tâches ou des commentaires depuis un fichier"""
+    importer = ImportController(repository)
+
+    if args.type == "comments":
+        report = importer.import_comments(args.path, args.format)
+        label = "commentaires"
+    else:
+        report = importer.import_tasks(args.path, args.format)
+        label = "tâches"
+
+    print(f"✅ {report['rows']} {label} importé(e)s en {report['seconds']:.2f} s "
+          f"({report['rows_per_sec']:.0f} lignes/s)")
+    return 0
+
+
+def cmd_export(repository: Repository, args) -> int:
+    """Exporte les tâches ou les commentaires vers un fichier"""
+    exporter = ExportController(repository)
+
+    if args.type == "comments":
+        report = exporter.export_comments(args.path, args.format)
+        label = "commentaires"
+    else:
+        report = exporter.export_tasks(args.path, args.format)
+        label = "tâches"
+
+    print(f"✅ {report['rows']} {label} exporté(e)s en {report['seconds']:.2f} s "
+          f"({report['rows_per_sec']:.0f} lignes/s)")
+    return 0
+
+
+def cmd_convert_dates(repository: Repository, args) -> int:
+    """Convertit le stockage des dates (texte ISO <-> entier epoch)"""
+    database = repository.database
+    if database.dates.name == args.target:
+        print(f"ℹ️ Les dates sont déjà au format {args.target}")
+        return 0
+
+    database.convert_date_storage(args.target)
+    return 0
+
+
+def cmd_check_comments(repository: Repository, args) -> int:
+    """Vérifie (et corrige avec --fix) les compteurs de commentaires des tâches"""
+    mismatches = CommentController(repository).check_comment_counts(args.fix)
+    if not mismatches:
+        print("✅ Compteurs de commentaires cohérents")
+        return 0
+
+    for task_id, stored, actual in mismatches[:20]:
+        print(f"⚠️ Tâche #{task_id} : compteur {stored}, {actual} commentaire(s) en base")
+    if len(mismatches) > 20:
+        print(f"   ... et {len(mismatches) - 20} autre(s)")
+
+    if args.fix:
+        print(f"🔧 {len(mismatches)} compteur(s) corrigé(s)")
+        return 0
+    print(f"❌ {len(mismatches)} compteur(s) faux (relancer avec --fix pour corriger)")
+    return 1
+
+
+def cmd_archive(repository: Repository, args) -> int:
+    """Archive les tâches réalisées depuis plus de --days jours"""
+    task_ctrl = TaskController(repository)
+
+    start = time.perf_counter()
+    archived = task_ctrl.archive_done_tasks(args.days, args.batch_size)
+    duration = time.perf_counter() - start
+
+    print(f"🗄️ {archived} tâche(s) archivée(s) en {duration:.2f} s "
+          f"({task_ctrl.count_archived_tasks()} au total dans les archives)")
+
+    conflicts = task_ctrl.get_archive_conflicts(args.days)
+    if not conflicts:
+        return 0
+
+    shown = ", ".join(f"#{task_id}" for task_id in conflicts[:20])
+    more = f" ... et {len(conflicts) - 20} autre(s)" if len(conflicts) > 20 else ""
+    print(f"⚠️ {len(conflicts)} tâche(s) non archivée(s), id déjà présent dans les archives : {shown}{more}")
+    return 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construit le parseur des sous-commandes"""
+    parser = argparse.ArgumentParser(description="Outils PyTask en ligne de commande")
+    parser.add_argument("--db", default="database/tasks.db", help="Chemin de la base SQLite")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p_import = subparsers.add_parser("import", help="Importer un fichier CSV ou JSON Lines")
+    p_import.add_argument("path", help="Fichier à importer")
+    p_import.add_argument("--type", choices=["tasks", "comments"], default="tasks",
+                          help="Contenu du fichier (défaut : tasks)")
+    p_import.add_argument("--format", choices=FORMATS,
+                          help="Format du fichier (défaut : d'après l'extension)")
+    p_import.set_defaults(func=cmd_import)
+
+    p_export = subparsers.add_parser("export", help="Exporter vers un fichier CSV ou JSON Lines")
+    p_export.add_argument("path", help="Fichier de destination")
+    p_export.add_argument("--type", choices=["tasks", "comments"], default="tasks",
+                          help="Contenu à exporter (défaut : tasks)")
+    p_export.add_argument("--format", choices=FORMATS,
+                          help="Format du fichier (défaut : d'après l'extension)")
+    p_export.set_defaults(func=cmd_export)
+
+    p_dates = subparsers.add_parser("convert-dates", help="Changer le format de stockage des dates")
+    p_dates.add_argument("target", choices=list(DATE_STORAGES),
+                         help="iso (texte ISO 8601, lecture la plus rapide) ou epoch "
+                              "(entier, plus compact mais lecture plus lente)")
+    p_dates.set_defaults(func=cmd_convert_dates)
+
+    p_check = subparsers.add_parser("check-comments",
+                                    help="Vérifier les compteurs de commentaires des tâches")
+    p_check.add_argument("--fix", action="store_true", help="Corriger les compteurs faux")
+    p_check.set_defaults(func=cmd_check_comments)
+
+    p_archive = subparsers.add_parser("archive",
+                                      help="Archiver les tâches réalisées depuis longtemps")
+    p_archive.add_argument("--days", type=int, required=True,
+                           help="Archiver les tâches réalisées depuis plus de N jours")
+    p_archive.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE,
+                           help=f"Tâches déplacées par transaction (défaut : {ARCHIVE_BATCH_SIZE})")
+    p_archive.set_defaults(func=cmd_archive)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """Point d'entrée de la ligne de commande"""
+    args = build_parser().parse_args(argv)
+
+    db = Database(args.db)
+    db.init_database()
+    repository = Repository(db)
+
+    try:
+        return args.func(repository, args)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
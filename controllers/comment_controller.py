@@ -4,10 +4,13 @@ Plus simple que TaskController car moins de logique
 """
 
 from datetime import datetime
-from typing import List
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from models.comment import Comment
-from models.repository import Repository
+from models.repository import Repository, PageCursor
+
+# Nombre de commentaires chargés à la fois dans la fenêtre des commentaires
+COMMENT_PAGE_SIZE = 100
 
 class CommentController:
     """
@@ -27,21 +30,23 @@ class CommentController:
         if not texte or not texte.strip():
             raise ValueError("Le commentaire ne peut pas être vide")
 
-        # Vérification que la tâche existe
-        task = self.repository.get_task_by_id(task_id)
-        if not task:
-            raise ValueError(f"Tâche #{task_id} introuvable")
+        # Vérification et insertion dans la même transaction
+        with self.repository.transaction():
+            # Vérification que la tâche existe
+            task = self.repository.get_task_by_id(task_id)
+            if not task:
+                raise ValueError(f"Tâche #{task_id} introuvable")
 
-        # Création du commentaire
-        comment = Comment(
-            texte=texte.strip(),
-            task_id=task_id,
-            date_creation=datetime.now()
-        )
+            # Création du commentaire
+            comment = Comment(
+                texte=texte.strip(),
+                task_id=task_id,
+                date_creation=datetime.now()
+            )
 
-        # Sauvegarde
-        comment_id = self.repository.create_comment(comment)
-        comment.id = comment_id
+            # Sauvegarde
+            comment_id = self.repository.create_comment(comment)
+            comment.id = comment_id
 
         return comment
 
@@ -49,11 +54,33 @@ class CommentController:
         """Récupère tous les commentaires d'une tâche"""
         return self.repository.get_comments_by_task(task_id)
 
+    def get_comments_page(self, task_id: int, after: Optional[PageCursor] = None,
+                          limit: int = COMMENT_PAGE_SIZE) -> Tuple[List[Comment], Optional[PageCursor]]:
+        """
+        Récupère une page de commentaires d'une tâche (plus récents d'abord)
+        Retourne (commentaires, curseur de la page suivante ou None)
+        """
+        return self.repository.get_comments_page(task_id, after, limit)
+
     def delete_comment(self, comment_id: int):
         """Supprime un commentaire"""
         self.repository.delete_comment(comment_id)
 
     def count_comments_for_task(self, task_id: int) -> int:
-        """Compte le nombre de commentaires d'une tâche"""
-        comments = self.repository.get_comments_by_task(task_id)
-        return len(comments)
+        """Nombre de commentaires d'une tâche (colonne tasks.comment_count)"""
+        return self.repository.count_comments_by_tasks([task_id])[task_id]
+
+    def count_comments_for_tasks(self, task_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Nombre de commentaires de plusieurs tâches en une seule requête
+        Évite une requête par ligne lors du remplissage des tableaux
+        (lit tasks.comment_count, sans compter les commentaires)
+        """
+        return self.repository.count_comments_by_tasks(task_ids)
+
+    def check_comment_counts(self, fix: bool = False) -> List[Tuple[int, int, int]]:
+        """
+        Vérifie les compteurs tasks.comment_count (et les corrige si fix)
+        Retourne les écarts trouvés : (task_id, compteur stocké, nombre réel)
+        """
+        return self.repository.check_comment_counts(fix)
@@ -0,0 +1,206 @@
+"""
+DeadlineClassifier - Classe les tâches par échéance en un seul passage
+Un seul instant de référence (now) pour les filtres des onglets, le retard
+des lignes et les statistiques : plus de datetime.now() différent par appel
+DeadlineQueue - Prochaines échéances, pour ne reclasser que les tâches qui passent en retard
+"""
+
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import heapq
+
+from models.task import Task
+
+# Compartiments d'échéance (bits combinables : une tâche du jour est aussi de la semaine)
+TODAY = 1
+WEEK = 2
+MONTH = 4
+URGENT = 8     # Échéance avant J+4 (retard compris), tâche non réalisée
+OVERDUE = 16   # Échéance dépassée, tâche non réalisée
+
+# Compartiments par nom (les quatre premiers sont les onglets datés)
+BUCKETS = {"today": TODAY, "week": WEEK, "month": MONTH, "urgent": URGENT, "overdue": OVERDUE}
+TAB_BUCKETS = {name: BUCKETS[name] for name in ("today", "week", "month", "urgent")}
+
+# Bits réservés aux tâches non réalisées
+OPEN_ONLY = URGENT | OVERDUE
+
+# Échéance des tâches qui n'en ont pas : après toutes les bornes, aucun compartiment
+NO_DEADLINE = float("inf")
+
+
+def due_seconds(task: Task) -> float:
+    """Échéance en secondes epoch (comme EpochDateStorage), NO_DEADLINE si aucune"""
+    return task.date_echeance.timestamp() if task.date_echeance else NO_DEADLINE
+
+
+class DeadlineClassifier:
+    """
+    Photo de l'horloge à un instant donné et classement des échéances
+
+    Les compartiments sont des intervalles [début, fin[ : leurs bornes triées
+    découpent l'axe du temps en quelques intervalles dont les bits sont
+    calculés une fois. Classer une échéance = une dichotomie (bisect) sur ces
+    bornes puis une lecture de table, sans créer aucun datetime.
+
+    Exemple :
+        clock = DeadlineClassifier()
+        flags = clock.classify(tasks)          # {id: bits}
+        en_retard = [i for i, f in flags.items() if f & OVERDUE]
+    """
+
+    def __init__(self, now: Optional[datetime] = None):
+        self.now = now or datetime.now()
+
+        today = datetime.combine(self.now.date(), time.min)
+        month_start = today.replace(day=1)
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+
+        # (début, fin) de chaque compartiment, None = pas de borne de début
+        self._ranges = {
+            TODAY: (today, today + timedelta(days=1)),
+            WEEK: (today, today + timedelta(days=8)),    # jusqu'à J+7 inclus
+            MONTH: (month_start, next_month),
+            URGENT: (None, today + timedelta(days=4)),   # jusqu'à J+3 inclus
+            OVERDUE: (None, self.now),
+        }
+
+        bounds = sorted({bound for start_end in self._ranges.values()
+                         for bound in start_end if bound is not None})
+        self._bounds = array('d', (bound.timestamp() for bound in bounds))
+
+        # Bits de l'intervalle n° i = bisect_right(bornes, échéance) :
+        # [bornes[i-1], bornes[i][ (avant la première borne pour i = 0)
+        open_flags = [self._flags_at(None)] + [self._flags_at(bound) for bound in bounds]
+        self._interval_flags = (
+            [flags & ~OPEN_ONLY for flags in open_flags],  # Tâches réalisées
+            open_flags                                     # Tâches non réalisées
+        )
+
+    def _flags_at(self, due: Optional[datetime]) -> int:
+        """Bits d'une échéance (None = avant toutes les bornes)"""
+        flags = 0
+        for bucket, (start, end) in self._ranges.items():
+            after_start = start is None or (due is not None and due >= start)
+            if after_start and (due is None or due < end):
+                flags |= bucket
+        return flags
+
+    def tab_filters(self) -> Dict[str, dict]:
+        """
+        Filtres SQL des onglets datés (arguments de get_tasks_page),
+        mêmes intervalles que les bits TODAY / WEEK / MONTH / URGENT
+        """
+        filters = {}
+        for name, bucket in TAB_BUCKETS.items():
+            start, end = self._ranges[bucket]
+            filters[name] = {"due_end": end} if start is None else {"due_start": start, "due_end": end}
+        filters["urgent"]["exclude_etat"] = "Réalisé"
+        return filters
+
+    def classify_columns(self, due: Sequence[float], is_open: Sequence[int]) -> array:
+        """
+        Classe des tâches données en colonnes : échéances en secondes
+        (NO_DEADLINE si aucune) et 1 si la tâche n'est pas réalisée
+        Retourne les bits de chaque tâche, dans le même ordre
+        """
+        bounds = self._bounds
+        tables = self._interval_flags
+        return array('B', [tables[o][bisect_right(bounds, d)] for d, o in zip(due, is_open)])
+
+    def classify(self, tasks: Iterable[Task]) -> Dict[int, int]:
+        """Bits de chaque tâche : {id: bits}"""
+        tasks = list(tasks)
+        flags = self.classify_columns(
+            array('d', [due_seconds(task) for task in tasks]),
+            [not task.est_terminee() for task in tasks]
+        )
+        return {task.id: bits for task, bits in zip(tasks, flags)}
+
+    def flags(self, task: Task) -> int:
+        """Bits d'une seule tâche"""
+        return self._interval_flags[not task.est_terminee()][bisect_right(self._bounds, due_seconds(task))]
+
+    @staticmethod
+    def count(flags: Iterable[int]) -> Dict[str, int]:
+        """Nombre de tâches par compartiment"""
+        histogram = Counter(flags)  # Quelques combinaisons de bits seulement
+        return {
+            name: sum(n for bits, n in histogram.items() if bits & bucket)
+            for name, bucket in BUCKETS.items()
+        }
+
+
+class DeadlineQueue:
+    """
+    Échéances à venir des tâches non réalisées, la plus proche d'abord (tas binaire)
+    Sert à programmer un seul minuteur : la prochaine échéance à passer
+
+    Suppression paresseuse : une tâche modifiée ou retirée laisse son ancienne
+    entrée dans le tas, ignorée au moment où elle remonte (_due fait foi)
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int]] = []
+        self._due: Dict[int, float] = {}
+
+    def reset(self, due: Dict[int, float]):
+        """
+        Repart d'échéances à venir de tâches non réalisées : {id: secondes epoch}
+        (voir TaskController.get_open_deadlines)
+        """
+        self._due = dict(due)
+        self._heap = [(seconds, task_id) for task_id, seconds in self._due.items()]
+        heapq.heapify(self._heap)
+
+    def update(self, task: Task, now: datetime):
+        """Ajoute, déplace ou retire l'échéance d'une tâche (nouvelle ou modifiée)"""
+        due = due_seconds(task)
+        if task.est_terminee() or due == NO_DEADLINE or due < now.timestamp():
+            self.discard(task.id)
+            return
+
+        if self._due.get(task.id) != due:
+            self._due[task.id] = due
+            heapq.heappush(self._heap, (due, task.id))
+            self._compact()
+
+    def discard(self, task_id: int):
+        """Oublie l'échéance d'une tâche (supprimée, réalisée...)"""
+        if self._due.pop(task_id, None) is not None:
+            self._compact()
+
+    def next_due(self) -> Optional[float]:
+        """Prochaine échéance en secondes epoch, None s'il n'y en a plus"""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_passed(self, now: datetime) -> List[int]:
+        """Retire et retourne les tâches dont l'échéance est passée à l'instant now"""
+        limit = now.timestamp()
+        passed = []
+        self._drop_stale()
+        while self._heap and self._heap[0][0] < limit:
+            _, task_id = heapq.heappop(self._heap)
+            del self._due[task_id]
+            passed.append(task_id)
+            self._drop_stale()
+        return passed
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def _drop_stale(self):
+        """Retire du sommet du tas les entrées périmées"""
+        heap = self._heap
+        while heap and self._due.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def _compact(self):
+        """Reconstruit le tas quand les entrées périmées y sont majoritaires"""
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._heap = [(due, task_id) for task_id, due in self._due.items()]
+            heapq.heapify(self._heap)
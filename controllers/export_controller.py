@@ -0,0 +1,104 @@
+"""
+ExportController - Export en masse de tâches et commentaires
+Écrit des fichiers CSV ou JSON Lines au fil de l'eau, en mémoire constante
+"""
+
+import csv
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+from models.repository import Repository
+from controllers.import_controller import FORMATS
+
+# Colonnes exportées (mêmes noms que la base, relisibles par ImportController)
+TASK_FIELDS = ["id", "titre", "description", "etat", "date_echeance", "date_fin", "date_creation"]
+COMMENT_FIELDS = ["id", "task_id", "texte", "date_creation"]
+
+
+class ExportController:
+    """
+    Contrôleur d'export : parcourt la base avec les itérateurs du repository
+    (fetchmany par paquets) et écrit chaque ligne dès qu'elle est lue
+    """
+
+    def __init__(self, repository: Repository):
+        """Initialise avec une instance du repository"""
+        self.repository = repository
+
+    def export_tasks(self, path: str, file_format: Optional[str] = None) -> Dict[str, float]:
+        """
+        Exporte toutes les tâches vers un fichier CSV ou JSON Lines
+
+        Returns:
+            Rapport {"rows", "seconds", "rows_per_sec"}
+        """
+        records = (
+            {
+                "id": task.id,
+                "titre": task.titre,
+                "description": task.description,
+                "etat": task.etat,
+                "date_echeance": self._format_date(task.date_echeance),
+                "date_fin": self._format_date(task.date_fin),
+                "date_creation": self._format_date(task.date_creation)
+            }
+            for task in self.repository.iter_tasks()
+        )
+        return self._write(path, file_format, TASK_FIELDS, records)
+
+    def export_comments(self, path: str, file_format: Optional[str] = None) -> Dict[str, float]:
+        """
+        Exporte tous les commentaires vers un fichier CSV ou JSON Lines
+
+        Returns:
+            Rapport {"rows", "seconds", "rows_per_sec"}
+        """
+        records = (
+            {
+                "id": comment.id,
+                "task_id": comment.task_id,
+                "texte": comment.texte,
+                "date_creation": self._format_date(comment.date_creation)
+            }
+            for comment in self.repository.iter_comments()
+        )
+        return self._write(path, file_format, COMMENT_FIELDS, records)
+
+    def _write(self, path: str, file_format: Optional[str], fields: list,
+               records: Iterator[dict]) -> Dict[str, float]:
+        """Écrit les lignes une par une dans le format demandé et mesure le débit"""
+        if file_format is None:
+            file_format = os.path.splitext(path)[1].lstrip(".").lower()
+        if file_format not in FORMATS:
+            raise ValueError(f"Format non supporté : {file_format}. Doit être parmi : {FORMATS}")
+
+        start = time.perf_counter()
+        rows = 0
+
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            if file_format == "csv":
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                for record in records:
+                    writer.writerow(record)
+                    rows += 1
+            else:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False))
+                    f.write("\n")
+                    rows += 1
+
+        seconds = time.perf_counter() - start
+        return {
+            "rows": rows,
+            "seconds": seconds,
+            "rows_per_sec": rows / seconds if seconds > 0 else float(rows)
+        }
+
+    @staticmethod
+    def _format_date(value: Optional[datetime]) -> str:
+        """Date ISO 8601 ou chaîne vide"""
+        return value.isoformat() if value else ""
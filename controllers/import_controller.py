@@ -0,0 +1,165 @@
+"""
+ImportController - Import en masse de tâches et commentaires
+Lit des fichiers CSV ou JSON Lines ligne par ligne et les insère en une transaction
+"""
+
+import csv
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+from models.task import Task
+from models.comment import Comment
+from models.repository import Repository
+
+FORMATS = ("csv", "jsonl")
+
+
+class ImportController:
+    """
+    Contrôleur d'import : transforme chaque ligne du fichier en Task / Comment
+    et les envoie au repository sous forme de générateur (mémoire constante)
+
+    Colonnes attendues (mêmes noms que dans la base) :
+    - tâches : titre, description, etat, date_echeance, date_fin, date_creation, id (optionnel)
+    - commentaires : task_id, texte, date_creation, id (optionnel)
+    Les dates sont au format ISO 8601 (ex: 2025-01-15T14:30:00). Une date avec
+    fuseau (+02:00, Z) est convertie en heure locale, comme toutes les dates de l'application
+    """
+
+    def __init__(self, repository: Repository):
+        """Initialise avec une instance du repository"""
+        self.repository = repository
+
+    def import_tasks(self, path: str, file_format: Optional[str] = None) -> Dict[str, float]:
+        """
+        Importe les tâches d'un fichier CSV ou JSON Lines
+
+        Returns:
+            Rapport {"rows", "seconds", "rows_per_sec"}
+        """
+        records = self._read_records(path, file_format)
+        return self._timed(lambda: self.repository.create_tasks_many(self._to_tasks(records)))
+
+    def import_comments(self, path: str, file_format: Optional[str] = None) -> Dict[str, float]:
+        """
+        Importe les commentaires d'un fichier CSV ou JSON Lines
+        Les tâches référencées par task_id doivent déjà exister
+
+        Returns:
+            Rapport {"rows", "seconds", "rows_per_sec"}
+        """
+        records = self._read_records(path, file_format)
+        return self._timed(lambda: self.repository.create_comments_many(self._to_comments(records)))
+
+    # ========== LECTURE ==========
+
+    def _read_records(self, path: str, file_format: Optional[str]) -> Iterator[dict]:
+        """Ouvre le fichier et retourne un générateur de dictionnaires"""
+        if file_format is None:
+            file_format = os.path.splitext(path)[1].lstrip(".").lower()
+        if file_format not in FORMATS:
+            raise ValueError(f"Format non supporté : {file_format}. Doit être parmi : {FORMATS}")
+
+        if not os.path.exists(path):
+            raise ValueError(f"Fichier introuvable : {path}")
+
+        if file_format == "csv":
+            return self._read_csv(path)
+        return self._read_jsonl(path)
+
+    @staticmethod
+    def _read_csv(path: str) -> Iterator[dict]:
+        """Lit un CSV avec en-tête, une ligne à la fois"""
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+    @staticmethod
+    def _read_jsonl(path: str) -> Iterator[dict]:
+        """Lit un fichier JSON Lines (un objet JSON par ligne), une ligne à la fois"""
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Ligne {line_number} : JSON invalide ({e})")
+
+    # ========== CONVERSION ==========
+
+    def _to_tasks(self, records: Iterator[dict]) -> Iterator[Task]:
+        """
+        Convertit les lignes en tâches (la validation de Task s'applique,
+        titre et description obligatoires comme dans TaskController.create_task)
+        """
+        now = datetime.now()
+        for line_number, record in enumerate(records, start=1):
+            try:
+                titre = (record.get("titre") or "").strip()
+                if not titre:
+                    raise ValueError("Le titre ne peut pas être vide")
+
+                description = (record.get("description") or "").strip()
+                if not description:
+                    raise ValueError("La description ne peut pas être vide")
+
+                yield Task(
+                    id=self._parse_int(record.get("id")),
+                    titre=titre,
+                    description=description,
+                    etat=record.get("etat") or "À faire",
+                    date_echeance=self._parse_date(record.get("date_echeance")),
+                    date_fin=self._parse_date(record.get("date_fin")),
+                    date_creation=self._parse_date(record.get("date_creation")) or now
+                )
+            except ValueError as e:
+                raise ValueError(f"Ligne {line_number} : {e}")
+
+    def _to_comments(self, records: Iterator[dict]) -> Iterator[Comment]:
+        """Convertit les lignes en commentaires (la validation de Comment s'applique)"""
+        now = datetime.now()
+        for line_number, record in enumerate(records, start=1):
+            try:
+                task_id = self._parse_int(record.get("task_id"))
+                if task_id is None:
+                    raise ValueError("task_id manquant")
+                yield Comment(
+                    id=self._parse_int(record.get("id")),
+                    task_id=task_id,
+                    texte=record.get("texte") or "",
+                    date_creation=self._parse_date(record.get("date_creation")) or now
+                )
+            except ValueError as e:
+                raise ValueError(f"Ligne {line_number} : {e}")
+
+    @staticmethod
+    def _parse_date(value) -> Optional[datetime]:
+        """Date ISO 8601 ou vide, toujours rendue naïve en heure locale"""
+        if not value:
+            return None
+        date = datetime.fromisoformat(value)
+        if date.tzinfo is not None:
+            date = date.astimezone().replace(tzinfo=None)
+        return date
+
+    @staticmethod
+    def _parse_int(value) -> Optional[int]:
+        """Entier ou vide"""
+        if value is None or value == "":
+            return None
+        return int(value)
+
+    @staticmethod
+    def _timed(run) -> Dict[str, float]:
+        """Exécute l'import et mesure le débit"""
+        start = time.perf_counter()
+        rows = run()
+        seconds = time.perf_counter() - start
+        return {
+            "rows": rows,
+            "seconds": seconds,
+            "rows_per_sec": rows / seconds if seconds > 0 else float(rows)
+        }
@@ -3,12 +3,16 @@ TaskController - Gère toute la logique métier liée aux tâches
 C'est lui qui orchestre les actions entre la vue et le repository
 """
 
-from datetime import datetime
-from typing import List, Optional
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from models.task import Task
-from models.repository import Repository
+from models.task import Task, ETATS_VALIDES
+from models.repository import Repository, PageCursor, SEARCH_LIMIT, ARCHIVE_BATCH_SIZE
+from controllers.deadline_classifier import DeadlineClassifier, OVERDUE
 
+# Nombre de tâches chargées à la fois dans les tableaux
+PAGE_SIZE = 200
 
 
 class TaskController:
@@ -53,6 +57,24 @@ class TaskController:
         """Récupère toutes les tâches"""
         return self.repository.get_all_tasks()
     
+    def get_tasks_page(self, after: Optional[PageCursor] = None, limit: int = PAGE_SIZE,
+                       **filters) -> Tuple[List[Task], Optional[PageCursor]]:
+        """
+        Récupère une page de tâches (plus récentes d'abord)
+        after est le curseur renvoyé par l'appel précédent, None pour la première page
+        filters : etat, due_start, due_end, exclude_etat (voir Repository.get_tasks_page)
+        """
+        return self.repository.get_tasks_page(after, limit, **filters)
+
+    def search(self, text: str, limit: int = SEARCH_LIMIT) -> List[Task]:
+        """
+        Recherche les tâches par mots-clés (titre, description, commentaires)
+        Résultats triés par pertinence, liste vide si la recherche est vide
+        """
+        if not text or not text.strip():
+            return []
+        return self.repository.search(text.strip(), limit)
+
     def get_task_by_id(self, task_id: int) -> Optional[Task]:
         """Récupère une tâche par son ID"""
         return self.repository.get_task_by_id(task_id)
@@ -63,11 +85,6 @@ class TaskController:
         Met à jour une tâche existante
         Gère automatiquement la date de fin si l'état passe à "Réalisé"
         """
-        # Récupération de la tâche
-        task = self.repository.get_task_by_id(task_id)
-        if not task:
-            raise ValueError(f"Tâche #{task_id} introuvable")
-        
         # Validation
         if not titre or not titre.strip():
             raise ValueError("Le titre ne peut pas être vide")
@@ -75,87 +92,202 @@ class TaskController:
         if not description or not description.strip():
             raise ValueError("La description ne peut pas être vide")
         
-        # Mise à jour des champs
-        task.titre = titre.strip()
-        task.description = description.strip()
-        task.etat = etat
-        task.date_echeance = date_echeance
-        
-        # Si la tâche passe à "Réalisé", on enregistre la date de fin
-        if etat == "Réalisé" and task.date_fin is None:
-            task.date_fin = datetime.now()
-        
-        # Si on repasse la tâche en cours, on retire la date de fin
-        if etat != "Réalisé" and task.date_fin is not None:
-            task.date_fin = None
-        
-        # Sauvegarde
-        self.repository.update_task(task)
+        # Lecture et écriture dans la même transaction (un seul commit)
+        with self.repository.transaction():
+            # Récupération de la tâche
+            task = self.repository.get_task_by_id(task_id)
+            if not task:
+                raise ValueError(f"Tâche #{task_id} introuvable")
+
+            # Mise à jour des champs
+            task.titre = titre.strip()
+            task.description = description.strip()
+            task.etat = etat
+            task.date_echeance = date_echeance
+
+            # Si la tâche passe à "Réalisé", on enregistre la date de fin
+            if etat == "Réalisé" and task.date_fin is None:
+                task.date_fin = datetime.now()
+
+            # Si on repasse la tâche en cours, on retire la date de fin
+            if etat != "Réalisé" and task.date_fin is not None:
+                task.date_fin = None
+
+            # Sauvegarde
+            self.repository.update_task(task)
     
     def delete_task(self, task_id: int):
         """Supprime une tâche (et tous ses commentaires)"""
-        task = self.repository.get_task_by_id(task_id)
-        if not task:
-            raise ValueError(f"Tâche #{task_id} introuvable")
-        
-        self.repository.delete_task(task_id)
+        with self.repository.transaction():
+            task = self.repository.get_task_by_id(task_id)
+            if not task:
+                raise ValueError(f"Tâche #{task_id} introuvable")
+
+            self.repository.delete_task(task_id)
     
     def change_task_state(self, task_id: int, new_state: str):
         """Change uniquement l'état d'une tâche"""
-        task = self.repository.get_task_by_id(task_id)
-        if not task:
-            raise ValueError(f"Tâche #{task_id} introuvable")
-        
-        task.etat = new_state
-        
-        # Gestion de la date de fin
-        if new_state == "Réalisé" and task.date_fin is None:
-            task.date_fin = datetime.now()
-        elif new_state != "Réalisé":
-            task.date_fin = None
-        
-        self.repository.update_task(task)
+        with self.repository.transaction():
+            task = self.repository.get_task_by_id(task_id)
+            if not task:
+                raise ValueError(f"Tâche #{task_id} introuvable")
+
+            task.etat = new_state
+
+            # Gestion de la date de fin
+            if new_state == "Réalisé" and task.date_fin is None:
+                task.date_fin = datetime.now()
+            elif new_state != "Réalisé":
+                task.date_fin = None
+
+            self.repository.update_task(task)
     
     def close_task(self, task_id: int):
         """ Clôture rapide d'une tâche """
 
-        task = self.repository.get_task_by_id(task_id)
-        if not task:
-            raise ValueError(f"Tâche #{task_id} introuvable")
-    
-    # Vérifier qu'elle n'est pas déjà clôturée
-        if task.etat == "Réalisé":
-            raise ValueError("Cette tâche est déjà clôturée")
-    
-    # Clôture
-        task.etat = "Réalisé"
-        task.date_fin = datetime.now()
-    
-        self.repository.update_task(task)
+        with self.repository.transaction():
+            task = self.repository.get_task_by_id(task_id)
+            if not task:
+                raise ValueError(f"Tâche #{task_id} introuvable")
+
+            # Vérifier qu'elle n'est pas déjà clôturée
+            if task.etat == "Réalisé":
+                raise ValueError("Cette tâche est déjà clôturée")
+
+            # Clôture
+            task.etat = "Réalisé"
+            task.date_fin = datetime.now()
+
+            self.repository.update_task(task)
+
+
+
+    # ========== ARCHIVES ==========
+
+    def archive_done_tasks(self, days: int, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+        """
+        Archive les tâches réalisées depuis plus de days jours (avec leurs commentaires)
+        Elles disparaissent des onglets et des statistiques, search_archive les retrouve
+        Retourne le nombre de tâches archivées (sans les conflits, voir get_archive_conflicts)
+        """
+        if days < 0:
+            raise ValueError("Le nombre de jours doit être positif")
+        if batch_size < 1:
+            raise ValueError("La taille des lots doit être au moins 1")
 
+        return self.repository.archive_tasks(datetime.now() - timedelta(days=days), batch_size)
 
+    def get_archive_conflicts(self, days: int) -> List[int]:
+        """
+        Tâches réalisées depuis plus de days jours que archive_done_tasks laisse
+        en place : leur id est déjà utilisé dans les archives
+        """
+        return self.repository.get_archive_conflicts(datetime.now() - timedelta(days=days))
+
+    def search_archive(self, text: str, limit: int = SEARCH_LIMIT) -> List[Task]:
+        """Recherche plein texte dans les tâches archivées, par pertinence"""
+        return self.repository.search_archive(text, limit)
+
+    def count_archived_tasks(self) -> int:
+        """Nombre de tâches archivées"""
+        return self.repository.count_archived_tasks()
+
+    # ========== OPÉRATIONS GROUPÉES ==========
+    # Une seule requête UPDATE/DELETE pour toutes les tâches sélectionnées
+
+    def change_states(self, task_ids: Iterable[int], etat: str) -> int:
+        """
+        Change l'état de plusieurs tâches (même gestion de date_fin que change_task_state)
+        Retourne le nombre de tâches modifiées
+        """
+        if etat not in ETATS_VALIDES:
+            raise ValueError(f"État invalide. Doit être parmi : {list(ETATS_VALIDES)}")
+
+        return self.repository.set_tasks_state(task_ids, etat, datetime.now())
+
+    def close_tasks(self, task_ids: Iterable[int]) -> int:
+        """
+        Clôture plusieurs tâches (les tâches déjà clôturées sont ignorées)
+        Retourne le nombre de tâches clôturées
+        """
+        return self.change_states(task_ids, "Réalisé")
+
+    def delete_tasks(self, task_ids: Iterable[int]) -> int:
+        """
+        Supprime plusieurs tâches (et leurs commentaires)
+        Retourne le nombre de tâches supprimées
+        """
+        return self.repository.delete_tasks(task_ids)
+
+    # ========== RAFRAÎCHISSEMENT INCRÉMENTAL ==========
+
+    def get_last_change_seq(self) -> int:
+        """Numéro de la dernière modification (point de départ de get_changes_since)"""
+        return self.repository.get_last_change_seq()
+
+    def get_changes_since(self, since: int) -> Tuple[int, Optional[Dict[int, Optional[Task]]]]:
+        """
+        Tâches modifiées depuis le numéro since
+        Retourne (nouveau numéro, {id: tâche actuelle ou None si supprimée}).
+        Le dictionnaire vaut None si l'historique a été purgé : tout recharger.
+        """
+        changes = self.repository.get_changes_since(since)
+        if changes is None:
+            return self.repository.get_last_change_seq(), None
+        if not changes:
+            return since, {}
+
+        changed = dict.fromkeys(task_id for _, task_id, _ in changes)
+        for task in self.repository.get_tasks_by_ids(changed):
+            changed[task.id] = task
+
+        return changes[-1][0], changed
+
+    def prune_changes(self, upto: int) -> int:
+        """Purge le journal des modifications jusqu'au numéro upto"""
+        return self.repository.prune_changes(upto)
 
     def get_tasks_by_state(self, etat: str) -> List[Task]:
         """Filtre les tâches par état"""
         all_tasks = self.repository.get_all_tasks()
         return [task for task in all_tasks if task.etat == etat]
     
-    def get_overdue_tasks(self) -> List[Task]:
-        """Retourne les tâches en retard"""
-        all_tasks = self.repository.get_all_tasks()
-        return [task for task in all_tasks if task.est_en_retard()]
-    
-    def get_stats(self) -> dict:
+    def get_overdue_tasks(self, now: Optional[datetime] = None) -> List[Task]:
+        """
+        Retourne les tâches en retard (par rapport à now, par défaut maintenant)
+        Seules les tâches en retard sont chargées (voir classify_deadlines)
+        """
+        ids, flags = self.classify_deadlines(now)
+        return self.repository.get_tasks_by_ids(
+            task_id for task_id, bits in zip(ids, flags) if bits & OVERDUE
+        )
+
+    def classify_deadlines(self, now: Optional[datetime] = None) -> Tuple[array, array]:
+        """
+        Classe toutes les tâches par échéance en un seul passage (même instant now)
+        Retourne (ids, bits) : deux colonnes dans le même ordre, bits combinant
+        TODAY / WEEK / MONTH / URGENT / OVERDUE (voir DeadlineClassifier.count)
+        """
+        ids, due, is_open = self.repository.get_deadline_columns()
+        return ids, DeadlineClassifier(now).classify_columns(due, is_open)
+
+    def get_open_deadlines(self, start: datetime, end: datetime) -> Dict[int, float]:
+        """Échéances dans [start, end[ des tâches non réalisées : {id: secondes epoch}"""
+        return self.repository.get_open_deadlines(start, end)
+
+    def get_deadline_counts(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Nombre de tâches par compartiment d'échéance (today, week, month, urgent, overdue)"""
+        _, flags = self.classify_deadlines(now)
+        return DeadlineClassifier.count(flags)
+
+    def get_stats(self, now: Optional[datetime] = None) -> dict:
         """
         Retourne des statistiques sur les tâches
-        Utile pour un tableau de bord
+        Utile pour un tableau de bord (calcul fait en SQL, sans charger les tâches)
+        now : instant de référence du retard (par défaut maintenant)
         """
-        all_tasks = self.repository.get_all_tasks()
-        
-        return {
-            "total": len(all_tasks),
-            "a_faire": len([t for t in all_tasks if t.etat == "À faire"]),
-            "en_cours": len([t for t in all_tasks if t.etat == "En cours"]),
-            "realise": len([t for t in all_tasks if t.etat == "Réalisé"]),
-            "en_retard": len([t for t in all_tasks if t.est_en_retard()])
-        }
+        return self.repository.get_stats(now or datetime.now())
+
+    def close_thread_connection(self):
+        """Ferme la connexion SQLite du thread courant (à appeler en fin de worker)"""
+        self.repository.close_thread_connection()
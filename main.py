@@ -31,8 +31,8 @@ def main():
     db.init_database()
     print("✅ Base de données initialisée")
 
-    # Repository (accès aux données)
-    repository = Repository(db)
+    # Repository (accès aux données), avec un cache des tâches lues par ID
+    repository = Repository(db, cache_size=512)
     print("✅ Repository créé")
 
     # Contrôleurs (logique métier)
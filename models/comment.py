@@ -7,11 +7,12 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Comment:
     """
     Un commentaire avec texte et date automatique
     task_id lie le commentaire à une tâche précise
+    slots=True : pas de __dict__ par instance (moins de mémoire)
     """
     texte: str
     task_id: int
@@ -22,3 +23,16 @@ class Comment:
         """Validation du texte"""
         if not self.texte or not self.texte.strip():
             raise ValueError("Le texte du commentaire ne peut pas être vide")
+
+    @classmethod
+    def from_db(cls, id: int, task_id: int, texte: str, date_creation: datetime) -> "Comment":
+        """
+        Construction rapide sans validation, réservée aux lignes lues en base
+        (elles ont déjà été validées à l'écriture)
+        """
+        comment = object.__new__(cls)
+        comment.id = id
+        comment.task_id = task_id
+        comment.texte = texte
+        comment.date_creation = date_creation
+        return comment
@@ -5,77 +5,388 @@ Crée et initialise la base de données
 
 import sqlite3
 import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from models.date_storage import DATE_COLUMNS, IsoDateStorage, get_date_storage
+from models.migrations import MIGRATIONS
+from models.sqlite_profile import SQLiteProfile, get_profile, profile_from_env, read_env_file
 
 class Database:
     """
-    Classe singleton pour gérer la connexion à SQLite
+    Classe singleton pour gérer les connexions à SQLite
     Crée automatiquement le dossier et les tables si nécessaire
+
+    Chaque thread a sa propre connexion (sqlite3 interdit de partager une
+    connexion entre threads) : le Repository peut donc être appelé depuis des
+    workers QThreadPool. Les écritures passent toutes par writer(), qui les
+    sérialise avec un verrou unique pour éviter les "database is locked".
+
+    Cycle de vie des connexions : elles sont rangées par identifiant de thread
+    (threading.get_ident) et restent ouvertes jusqu'à close_thread_connection()
+    (fin de chaque tâche d'un worker, voir views/workers.py) ou close() (fin
+    de l'application). Un thread qui n'appelle jamais close_thread_connection
+    (thread principal, scripts) garde la sienne jusqu'à close().
     """
 
-    def __init__(self, db_path: str = "database/tasks.db"):
+    def __init__(self, db_path: str = "database/tasks.db",
+                 profile: Optional[Union[str, SQLiteProfile]] = None,
+                 date_storage: Optional[str] = None):
         """
         Initialise la connexion à la base de données
 
         Args:
             db_path: Chemin vers le fichier SQLite (défaut: database/tasks.db)
+            profile: Réglages SQLite ("safe", "fast" ou un SQLiteProfile).
+                     Par défaut : DB_PROFILE et DB_* du .env / de l'environnement
+            date_storage: Format des dates souhaité ("iso" ou "epoch"). Si la base
+                          est dans l'autre format, init_database la convertit.
+                          Par défaut : DB_DATE_STORAGE, sinon on garde le format existant
         """
         self.db_path = db_path
 
+        if profile is None:
+            profile = profile_from_env()
+        elif isinstance(profile, str):
+            profile = get_profile(profile)
+        self.profile = profile
+
+        if date_storage is None:
+            date_storage = os.environ.get("DB_DATE_STORAGE") or read_env_file().get("DB_DATE_STORAGE")
+        self.requested_date_storage = get_date_storage(date_storage) if date_storage else None
+
+        # Format réel de la base, lu dans la table settings par init_database
+        self.dates = IsoDateStorage
+
         # Créer le dossier database/ s'il n'existe pas
         db_dir = os.path.dirname(db_path)
         if db_dir and not os.path.exists(db_dir):
             os.makedirs(db_dir)
             print(f"📁 Dossier '{db_dir}' créé")
 
-        self.connection = None
+        # Une connexion par thread, par identifiant de thread (note : avec ":memory:"
+        # chaque thread aurait sa propre base). Pas de threading.local : les threads
+        # du QThreadPool, créés par Qt, en voient un nouveau à chaque tâche.
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+
+        # Profondeur des transactions imbriquées du thread courant
+        self._local = threading.local()
+
+        # Un seul écrivain à la fois (réentrant pour les appels imbriqués)
+        self.write_lock = threading.RLock()
 
     def get_connection(self) -> sqlite3.Connection:
         """
-        Retourne la connexion SQLite (crée si nécessaire)
+        Retourne la connexion SQLite du thread courant (crée si nécessaire)
         Utilise row_factory pour accéder aux colonnes par nom
         """
-        if self.connection is None:
-            self.connection = sqlite3.connect(self.db_path)
-            self.connection.row_factory = sqlite3.Row  # Accès par nom de colonne
-        return self.connection
+        thread_id = threading.get_ident()
+        conn = self._connections.get(thread_id)
+        if conn is None:
+            # check_same_thread=False uniquement pour que close() puisse tout fermer :
+            # chaque connexion n'est utilisée que par le thread qui l'a créée
+            conn = sqlite3.connect(self.db_path, timeout=self.profile.busy_timeout / 1000,
+                                   check_same_thread=False)
+            conn.row_factory = sqlite3.Row  # Accès par nom de colonne
+            self._apply_profile(conn)
+
+            with self._connections_lock:
+                self._connections[thread_id] = conn
+        return conn
 
-    def init_database(self):
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
         """
-        Crée les tables si elles n'existent pas
+        Ouvre une écriture sérialisée sur la connexion du thread courant
+        Commit à la sortie du bloc, rollback si une exception est levée
+        Dans un bloc transaction(), le commit est laissé à la transaction
+
+        Exemple :
+            with database.writer() as conn:
+                conn.execute("UPDATE ...")
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        # Table des tâches (noms en français)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                titre TEXT NOT NULL,
-                description TEXT,
-                etat TEXT NOT NULL DEFAULT 'À faire',
-                date_echeance TEXT,
-                date_fin TEXT,
-                date_creation TEXT NOT NULL
-            )
-        """)
-
-        # Table des commentaires (noms en français)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS comments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_id INTEGER NOT NULL,
-                texte TEXT NOT NULL,
-                date_creation TEXT NOT NULL,
-                FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE
-            )
-        """)
-
-        conn.commit()
+        with self.write_lock:
+            if getattr(self._local, "depth", 0):
+                # Savepoint : une erreur n'annule que cette écriture
+                with self.transaction() as conn:
+                    yield conn
+                return
+
+            conn = self.get_connection()
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Regroupe plusieurs écritures en une seule transaction (un seul commit)
+        Les writer() appelés dans le bloc ne commitent pas eux-mêmes.
+        Imbricable : les niveaux internes sont des SAVEPOINT, annulés seuls
+        si l'exception ne sort pas du bloc englobant.
+
+        Exemple :
+            with database.transaction():
+                repository.update_task(task)
+                repository.create_comment(comment)
+        """
+        with self.write_lock:
+            conn = self.get_connection()
+            depth = getattr(self._local, "depth", 0)
+            savepoint = f"sp_{depth}"
+
+            if depth == 0:
+                if conn.in_transaction:
+                    conn.commit()
+                # IMMEDIATE : les lectures du bloc voient déjà l'état qu'on va modifier
+                conn.execute("BEGIN IMMEDIATE")
+            else:
+                conn.execute(f"SAVEPOINT {savepoint}")
+
+            self._local.depth = depth + 1
+            try:
+                yield conn
+            except BaseException:
+                if depth == 0:
+                    conn.rollback()
+                else:
+                    conn.execute(f"ROLLBACK TO {savepoint}")
+                    conn.execute(f"RELEASE {savepoint}")
+                raise
+            else:
+                if depth == 0:
+                    conn.commit()
+                else:
+                    conn.execute(f"RELEASE {savepoint}")
+            finally:
+                self._local.depth = depth
+
+    def in_transaction(self) -> bool:
+        """Indique si le thread courant est dans un bloc transaction()"""
+        return getattr(self._local, "depth", 0) > 0
+
+    def _apply_profile(self, conn: sqlite3.Connection):
+        """Applique les PRAGMA du profil de performance à une connexion"""
+        for pragma, value in self.profile.pragmas().items():
+            # Valeurs validées par SQLiteProfile (PRAGMA n'accepte pas de paramètre lié)
+            conn.execute(f"PRAGMA {pragma} = {value}")
+
+        # Nécessaire pour que ON DELETE CASCADE supprime bien les commentaires
+        conn.execute("PRAGMA foreign_keys = ON")
+
+    def init_database(self) -> List[Tuple[int, str, float]]:
+        """
+        Crée les tables si elles n'existent pas puis applique les migrations
+
+        Returns:
+            Le rapport des migrations appliquées (voir migrate)
+        """
+        with self.writer() as conn:
+            cursor = conn.cursor()
+
+            # Table des tâches (noms en français)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    titre TEXT NOT NULL,
+                    description TEXT,
+                    etat TEXT NOT NULL DEFAULT 'À faire',
+                    date_echeance TEXT,
+                    date_fin TEXT,
+                    date_creation TEXT NOT NULL
+                )
+            """)
+
+            # Table des commentaires (noms en français)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS comments (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    task_id INTEGER NOT NULL,
+                    texte TEXT NOT NULL,
+                    date_creation TEXT NOT NULL,
+                    FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE
+                )
+            """)
+
         print("✅ Tables créées/vérifiées")
 
+        report = self.migrate()
+
+        self.dates = self._read_date_storage()
+        wanted = self.requested_date_storage
+        if wanted is not None and wanted is not self.dates:
+            self.convert_date_storage(wanted.name)
+
+        return report
+
+    def get_schema_version(self) -> int:
+        """Retourne la version du schéma (PRAGMA user_version)"""
+        conn = self.get_connection()
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate(self) -> List[Tuple[int, str, float]]:
+        """
+        Applique dans l'ordre les migrations plus récentes que PRAGMA user_version
+        Chaque migration est jouée dans sa propre transaction : en cas d'erreur
+        elle est annulée entièrement et la version reste inchangée
+
+        Returns:
+            Liste de (version, description, durée en secondes) des migrations appliquées
+        """
+        with self.write_lock:
+            return self._apply_migrations()
+
+    def _apply_migrations(self) -> List[Tuple[int, str, float]]:
+        """Applique les migrations en attente (appelé sous write_lock)"""
+        conn = self.get_connection()
+        current_version = self.get_schema_version()
+        report = []
+
+        for migration in MIGRATIONS:
+            if migration.version <= current_version:
+                continue
+
+            start = time.perf_counter()
+            try:
+                conn.execute("BEGIN")
+                for statement in migration.statements:
+                    conn.execute(statement)
+                # PRAGMA n'accepte pas de paramètre lié
+                conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                print(f"❌ Échec de la migration {migration.version} ({migration.description})")
+                raise
+            duration = time.perf_counter() - start
+
+            current_version = migration.version
+            report.append((migration.version, migration.description, duration))
+            print(f"🔧 Migration {migration.version} appliquée en {duration * 1000:.1f} ms"
+                  f" : {migration.description}")
+
+        return report
+
+    # ========== FORMAT DES DATES ==========
+
+    def _read_date_storage(self):
+        """Lit le format de stockage des dates de la base (table settings)"""
+        conn = self.get_connection()
+        row = conn.execute("SELECT value FROM settings WHERE key = 'date_storage'").fetchone()
+        return get_date_storage(row[0] if row else "iso")
+
+    def convert_date_storage(self, target: str) -> float:
+        """
+        Convertit toutes les colonnes de dates vers le format target ("iso" ou "epoch")
+
+        SQLite ne sait pas changer le type d'une colonne : chaque table est
+        reconstruite (procédure recommandée par SQLite) en conservant ses index,
+        ses triggers et son compteur AUTOINCREMENT. Le tout dans une seule
+        transaction : en cas d'erreur la base reste dans l'ancien format.
+
+        Returns:
+            Durée de la conversion en secondes
+        """
+        storage = get_date_storage(target)
+
+        with self.write_lock:
+            if self._read_date_storage() is storage:
+                return 0.0
+
+            conn = self.get_connection()
+            start = time.perf_counter()
+
+            # Ces PRAGMA sont sans effet dans une transaction : on les pose avant
+            conn.commit()
+            conn.execute("PRAGMA foreign_keys = OFF")
+            conn.execute("PRAGMA legacy_alter_table = ON")
+            try:
+                conn.execute("BEGIN")
+                for table, columns in DATE_COLUMNS.items():
+                    self._rebuild_table(conn, table, columns, storage)
+
+                conn.execute("UPDATE settings SET value = ? WHERE key = 'date_storage'", (storage.name,))
+
+                if conn.execute("PRAGMA foreign_key_check").fetchone():
+                    raise sqlite3.IntegrityError("Clés étrangères incohérentes après conversion")
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                print(f"❌ Échec de la conversion des dates en {storage.name}")
+                raise
+            finally:
+                conn.execute("PRAGMA legacy_alter_table = OFF")
+                conn.execute("PRAGMA foreign_keys = ON")
+
+            self.dates = storage
+            duration = time.perf_counter() - start
+            print(f"🔧 Dates converties au format {storage.name} en {duration * 1000:.1f} ms")
+            return duration
+
+    @staticmethod
+    def _rebuild_table(conn: sqlite3.Connection, table: str, date_columns, storage):
+        """Recrée une table avec le type de colonne de storage pour les dates"""
+        create_sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()[0]
+        dependents = [row[0] for row in conn.execute(
+            "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') "
+            "AND sql IS NOT NULL", (table,)
+        )]
+        sequence = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+        # Même définition, seul le type des colonnes de dates change
+        new_sql = re.sub(rf"^CREATE TABLE\s+(IF NOT EXISTS\s+)?\"?{table}\"?",
+                         f"CREATE TABLE {table}_new", create_sql)
+        for column in date_columns:
+            new_sql = re.sub(rf"\b{column}\s+(TEXT|INTEGER)\b",
+                             f"{column} {storage.column_type}", new_sql)
+        conn.execute(new_sql)
+
+        select = ", ".join(
+            storage.sql_from_other(column) if column in date_columns else column
+            for column in columns
+        )
+        conn.execute(f"INSERT INTO {table}_new ({', '.join(columns)}) SELECT {select} FROM {table}")
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+        for sql in dependents:
+            conn.execute(sql)
+        if sequence is not None:
+            conn.execute("DELETE FROM sqlite_sequence WHERE name = ?", (table,))
+            conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, sequence[0]))
+
+    def close_thread_connection(self):
+        """
+        Ferme la connexion du thread courant (fin de tâche d'un worker)
+        Le prochain get_connection de ce thread en ouvrira une nouvelle
+        """
+        with self._connections_lock:
+            conn = self._connections.pop(threading.get_ident(), None)
+        if conn is not None:
+            conn.close()
+
+    def open_connections(self) -> int:
+        """Nombre de connexions ouvertes (une par thread qui n'a pas encore fermé la sienne)"""
+        with self._connections_lock:
+            return len(self._connections)
+
     def close(self):
-        """Ferme proprement la connexion"""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
-            print("🔌 Connexion fermée")
+        """Ferme proprement toutes les connexions"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, {}
+        if not connections:
+            return
+        for conn in connections.values():
+            conn.close()
+        print("🔌 Connexion fermée")
@@ -0,0 +1,89 @@
+"""
+DateStorage - Format de stockage des dates dans SQLite
+"iso" : texte ISO 8601 (format historique), "epoch" : entier en secondes Unix
+"""
+
+from datetime import datetime
+from typing import Optional, Union
+
+# Colonnes de dates par table (converties par Database.convert_date_storage)
+DATE_COLUMNS = {
+    "tasks": ("date_echeance", "date_fin", "date_creation"),
+    "comments": ("date_creation",),
+    "tasks_archive": ("date_echeance", "date_fin", "date_creation"),
+    "comments_archive": ("date_creation",),
+}
+
+
+class IsoDateStorage:
+    """
+    Dates stockées en texte ISO 8601 (ex: 2025-01-15T14:30:00)
+    Lisible directement dans la base, mais 19 à 26 octets par date
+    """
+    name = "iso"
+    column_type = "TEXT"
+
+    @staticmethod
+    def encode(value: Optional[datetime]) -> Optional[str]:
+        """datetime -> valeur SQLite"""
+        return value.isoformat() if value is not None else None
+
+    # Valeur SQLite -> datetime (les NULL sont gérés par l'appelant)
+    decode = staticmethod(datetime.fromisoformat)
+
+    @staticmethod
+    def to_seconds(value: str) -> float:
+        """Valeur SQLite -> secondes epoch (heure locale, comme timestamp())"""
+        return datetime.fromisoformat(value).timestamp()
+
+    @staticmethod
+    def sql_from_other(column: str) -> str:
+        """Expression SQL convertissant une colonne epoch en texte ISO (heure locale)"""
+        return f"strftime('%Y-%m-%dT%H:%M:%S', {column}, 'unixepoch', 'localtime')"
+
+
+class EpochDateStorage:
+    """
+    Dates stockées en entier (secondes depuis 1970-01-01 UTC)
+    Les datetime naïfs de l'application sont en heure locale : la conversion
+    passe par timestamp() / fromtimestamp(). Les microsecondes sont perdues.
+    Colonnes et index plus compacts, comparaisons SQL sur des entiers.
+    Mais la relecture est plus lente qu'en ISO : fromtimestamp passe par
+    l'heure locale du système, fromisoformat non (1,5 à 2,5 fois plus lent
+    selon la machine, voir benchmarks/bench_hydration.py). Ce format ne fait
+    gagner que de la place.
+    """
+    name = "epoch"
+    column_type = "INTEGER"
+
+    @staticmethod
+    def encode(value: Optional[datetime]) -> Optional[int]:
+        """datetime -> valeur SQLite"""
+        return int(value.timestamp()) if value is not None else None
+
+    # Valeur SQLite -> datetime (les NULL sont gérés par l'appelant)
+    decode = staticmethod(datetime.fromtimestamp)
+
+    # Valeur SQLite -> secondes epoch : déjà le bon format
+    to_seconds = float
+
+    @staticmethod
+    def sql_from_other(column: str) -> str:
+        """Expression SQL convertissant une colonne texte ISO (heure locale) en epoch"""
+        return f"CAST(strftime('%s', {column}, 'utc') AS INTEGER)"
+
+
+DATE_STORAGES = {
+    IsoDateStorage.name: IsoDateStorage,
+    EpochDateStorage.name: EpochDateStorage,
+}
+
+DateStorage = Union[IsoDateStorage, EpochDateStorage]
+
+
+def get_date_storage(name: str):
+    """Retourne le format de stockage par son nom ("iso" ou "epoch")"""
+    try:
+        return DATE_STORAGES[name.lower()]
+    except KeyError:
+        raise ValueError(f"Format de date inconnu : {name}. Doit être parmi : {list(DATE_STORAGES)}")
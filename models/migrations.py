@@ -0,0 +1,191 @@
+"""
+Migrations - Évolutions successives du schéma SQLite
+Chaque migration a un numéro de version, appliqué via PRAGMA user_version
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    Une étape de migration : un numéro de version et les requêtes SQL à jouer
+    Les requêtes d'une migration sont appliquées dans une seule transaction
+    """
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+
+
+# Liste ordonnée des migrations (ne jamais modifier une migration déjà livrée,
+# toujours en ajouter une nouvelle à la fin)
+MIGRATIONS = (
+    Migration(1, "Index sur les commentaires et les tâches", (
+        "CREATE INDEX IF NOT EXISTS idx_comments_task_id ON comments (task_id)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_etat ON tasks (etat)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_date_echeance ON tasks (date_echeance)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_date_creation ON tasks (date_creation)",
+    )),
+    Migration(2, "Index composites pour la pagination par curseur (date_creation, id)", (
+        "CREATE INDEX IF NOT EXISTS idx_tasks_creation_id ON tasks (date_creation, id)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_etat_creation ON tasks (etat, date_creation, id)",
+        # Remplacé par idx_tasks_creation_id (même préfixe)
+        "DROP INDEX IF EXISTS idx_tasks_date_creation",
+    )),
+    Migration(3, "Table des réglages (format de stockage des dates)", (
+        "CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+        "INSERT OR IGNORE INTO settings (key, value) VALUES ('date_storage', 'iso')",
+    )),
+    Migration(4, "Recherche plein texte FTS5 (titres, descriptions, commentaires)", (
+        # Tables FTS "external content" : l'index seul, le texte reste dans tasks/comments
+        # remove_diacritics : "echeance" trouve "échéance" ; prefix : recherche à la frappe
+        """CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            titre, description,
+            content='tasks', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )""",
+        """CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5(
+            texte,
+            content='comments', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )""",
+        # Synchronisation par triggers
+        """CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, titre, description)
+            VALUES (new.id, new.titre, new.description);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, titre, description)
+            VALUES ('delete', old.id, old.titre, old.description);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF titre, description ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, titre, description)
+            VALUES ('delete', old.id, old.titre, old.description);
+            INSERT INTO tasks_fts (rowid, titre, description)
+            VALUES (new.id, new.titre, new.description);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS comments_fts_insert AFTER INSERT ON comments BEGIN
+            INSERT INTO comments_fts (rowid, texte) VALUES (new.id, new.texte);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS comments_fts_delete AFTER DELETE ON comments BEGIN
+            INSERT INTO comments_fts (comments_fts, rowid, texte) VALUES ('delete', old.id, old.texte);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS comments_fts_update AFTER UPDATE OF texte ON comments BEGIN
+            INSERT INTO comments_fts (comments_fts, rowid, texte) VALUES ('delete', old.id, old.texte);
+            INSERT INTO comments_fts (rowid, texte) VALUES (new.id, new.texte);
+        END""",
+        # Indexation des données existantes
+        "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+        "INSERT INTO comments_fts (comments_fts) VALUES ('rebuild')",
+    )),
+    Migration(5, "Journal des modifications de tâches (rafraîchissement incrémental)", (
+        # op : I = insertion, U = modification, D = suppression
+        # Pas de clé étrangère : on garde la trace des tâches supprimées
+        """CREATE TABLE IF NOT EXISTS task_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL,
+            op TEXT NOT NULL CHECK (op IN ('I', 'U', 'D'))
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS tasks_changes_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO task_changes (task_id, op) VALUES (new.id, 'I');
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS tasks_changes_update AFTER UPDATE ON tasks BEGIN
+            INSERT INTO task_changes (task_id, op) VALUES (new.id, 'U');
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS tasks_changes_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO task_changes (task_id, op) VALUES (old.id, 'D');
+        END""",
+        # Un commentaire ajouté ou supprimé change le compteur affiché de sa tâche
+        """CREATE TRIGGER IF NOT EXISTS comments_changes_insert AFTER INSERT ON comments BEGIN
+            INSERT INTO task_changes (task_id, op) VALUES (new.task_id, 'U');
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS comments_changes_delete AFTER DELETE ON comments BEGIN
+            INSERT INTO task_changes (task_id, op) VALUES (old.task_id, 'U');
+        END""",
+    )),
+    Migration(6, "Index composite pour la pagination des commentaires d'une tâche", (
+        "CREATE INDEX IF NOT EXISTS idx_comments_task_creation_id ON comments (task_id, date_creation, id)",
+        # Remplacé par idx_comments_task_creation_id (même préfixe)
+        "DROP INDEX IF EXISTS idx_comments_task_id",
+    )),
+    Migration(7, "Compteur de commentaires dénormalisé (tasks.comment_count)", (
+        "ALTER TABLE tasks ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0",
+        # Rattrapage des tâches qui ont des commentaires (utilise idx_comments_task_creation_id)
+        """UPDATE tasks SET comment_count = (
+            SELECT COUNT(*) FROM comments WHERE comments.task_id = tasks.id
+        ) WHERE id IN (SELECT task_id FROM comments)""",
+        # Tenu à jour par triggers, dans la transaction de l'écriture du commentaire
+        """CREATE TRIGGER IF NOT EXISTS comments_count_insert AFTER INSERT ON comments BEGIN
+            UPDATE tasks SET comment_count = comment_count + 1 WHERE id = new.task_id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS comments_count_delete AFTER DELETE ON comments BEGIN
+            UPDATE tasks SET comment_count = comment_count - 1 WHERE id = old.task_id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS comments_count_move AFTER UPDATE OF task_id ON comments BEGIN
+            UPDATE tasks SET comment_count = comment_count - 1 WHERE id = old.task_id;
+            UPDATE tasks SET comment_count = comment_count + 1 WHERE id = new.task_id;
+        END""",
+        # Le compteur modifié déclenche déjà tasks_changes_update pour la tâche
+        "DROP TRIGGER IF EXISTS comments_changes_insert",
+        "DROP TRIGGER IF EXISTS comments_changes_delete",
+    )),
+    Migration(8, "Archives des tâches réalisées (tasks_archive, comments_archive)", (
+        # Mêmes colonnes que tasks / comments. Les dates n'ont pas de type déclaré :
+        # une affinité TEXT transformerait les dates epoch copiées depuis tasks en texte,
+        # sans type elles gardent le format de stockage de la base (iso ou epoch)
+        """CREATE TABLE IF NOT EXISTS tasks_archive (
+            id INTEGER PRIMARY KEY,
+            titre TEXT NOT NULL,
+            description TEXT,
+            etat TEXT NOT NULL,
+            date_echeance,
+            date_fin,
+            date_creation NOT NULL,
+            comment_count INTEGER NOT NULL DEFAULT 0
+        )""",
+        """CREATE TABLE IF NOT EXISTS comments_archive (
+            id INTEGER PRIMARY KEY,
+            task_id INTEGER NOT NULL,
+            texte TEXT NOT NULL,
+            date_creation NOT NULL,
+            FOREIGN KEY (task_id) REFERENCES tasks_archive (id) ON DELETE CASCADE
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_comments_archive_task ON comments_archive (task_id, date_creation, id)",
+        # Recherche dans les archives (mêmes réglages que tasks_fts / comments_fts)
+        """CREATE VIRTUAL TABLE IF NOT EXISTS tasks_archive_fts USING fts5(
+            titre, description,
+            content='tasks_archive', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )""",
+        """CREATE VIRTUAL TABLE IF NOT EXISTS comments_archive_fts USING fts5(
+            texte,
+            content='comments_archive', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )""",
+        # Les archives ne sont jamais modifiées : insertion et suppression seulement
+        """CREATE TRIGGER IF NOT EXISTS tasks_archive_fts_insert AFTER INSERT ON tasks_archive BEGIN
+            INSERT INTO tasks_archive_fts (rowid, titre, description)
+            VALUES (new.id, new.titre, new.description);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS tasks_archive_fts_delete AFTER DELETE ON tasks_archive BEGIN
+            INSERT INTO tasks_archive_fts (tasks_archive_fts, rowid, titre, description)
+            VALUES ('delete', old.id, old.titre, old.description);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS comments_archive_fts_insert AFTER INSERT ON comments_archive BEGIN
+            INSERT INTO comments_archive_fts (rowid, texte) VALUES (new.id, new.texte);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS comments_archive_fts_delete AFTER DELETE ON comments_archive BEGIN
+            INSERT INTO comments_archive_fts (comments_archive_fts, rowid, texte)
+            VALUES ('delete', old.id, old.texte);
+        END""",
+    )),
+    Migration(9, "Refus des tâches dont l'id est déjà archivé", (
+        # Un import avec ids explicites (create_tasks_many) pourrait recréer une tâche
+        # archivée : son prochain archivage échouerait sur la clé de tasks_archive
+        """CREATE TRIGGER IF NOT EXISTS tasks_reject_archived_id BEFORE INSERT ON tasks
+        WHEN EXISTS (SELECT 1 FROM tasks_archive WHERE id = new.id) BEGIN
+            SELECT RAISE(ABORT, 'Cet id appartient à une tâche archivée');
+        END""",
+    )),
+)
@@ -3,32 +3,197 @@ Repository - Gère toute l'interaction avec la base SQLite
 Centralise toutes les requêtes SQL
 """
 
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import json
 import sqlite3
+import threading
 
 from models.task import Task
 from models.comment import Comment
 from models.database import Database
 
+# Nombre de lignes lues par fetchmany dans les itérateurs
+CHUNK_SIZE = 1000
+
+# Nombre maximum de résultats d'une recherche plein texte
+SEARCH_LIMIT = 200
+
+# Nombre de tâches déplacées vers les archives par transaction
+ARCHIVE_BATCH_SIZE = 500
+
+# Curseur de pagination : (date_creation telle que stockée, id) de la dernière ligne lue
+PageCursor = Tuple[Union[str, int], int]
+
+# Colonnes lues par les requêtes, dans l'ordre attendu par _to_tasks / _to_comments
+TASK_COLUMNS = "id, titre, description, etat, date_echeance, date_fin, date_creation"
+COMMENT_COLUMNS = "id, task_id, texte, date_creation"
+
+
 class Repository:
     """
     Classe qui gère les requêtes SQL via l'objet Database
+    Utilisable depuis plusieurs threads : chaque thread lit sur sa propre
+    connexion et les écritures sont sérialisées par Database.writer()
     """
 
-    def __init__(self, database: Database):
+    def __init__(self, database: Database, cache_size: int = 0):
         """
         Initialise le repository avec une instance Database
 
         Args:
             database: Instance de la classe Database
+            cache_size: Nombre de tâches gardées en cache pour get_task_by_id
+                        (LRU, 0 = pas de cache)
         """
         self.database = database
 
+        # Cache id -> Task (LRU borné), invalidé à chaque écriture de la tâche
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[int, Task]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_generation = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # IDs modifiés pendant la transaction en cours (par thread)
+        self._tx_local = threading.local()
+
     def _get_connection(self) -> sqlite3.Connection:
         """Retourne la connexion SQLite depuis Database"""
         return self.database.get_connection()
 
+    def close_thread_connection(self):
+        """Ferme la connexion du thread courant (fin de tâche d'un worker, voir Database)"""
+        self.database.close_thread_connection()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Exécute plusieurs opérations du repository en une seule transaction
+        Un seul commit à la fin, ou rollback complet si une exception sort du bloc.
+        Imbricable (SAVEPOINT), voir Database.transaction
+
+        Exemple :
+            with repository.transaction():
+                task = repository.get_task_by_id(task_id)
+                task.etat = "Réalisé"
+                repository.update_task(task)
+        """
+        outermost = not self.database.in_transaction()
+        if outermost:
+            self._tx_local.pending = set()
+        try:
+            with self.database.transaction() as conn:
+                yield conn
+        finally:
+            if outermost:
+                # Les invalidations faites pendant le bloc ont pu être suivies d'une
+                # lecture (autre thread : ancienne valeur, ce thread : valeur annulée)
+                pending, self._tx_local.pending = self._tx_local.pending, None
+                if pending:
+                    self._cache_invalidate(None if None in pending else pending)
+
+    # ========== CONVERSION LIGNES <-> OBJETS ==========
+
+    def _encode(self, value: Optional[datetime]):
+        """Convertit une date Python dans le format de stockage de la base (iso ou epoch)"""
+        return self.database.dates.encode(value)
+
+    def _to_tasks(self, rows) -> List[Task]:
+        """
+        Convertit des lignes (colonnes TASK_COLUMNS, dans cet ordre) en tâches
+        Seul endroit où les lignes de la table tasks sont hydratées :
+        accès par position (plus rapide que par nom), décodeur lu une seule fois
+        et Task.from_db (les lignes en base sont déjà validées)
+        """
+        decode = self.database.dates.decode
+        from_db = Task.from_db
+        return [
+            from_db(
+                row[0],                                 # id
+                row[1],                                 # titre
+                row[2],                                 # description
+                row[3],                                 # etat
+                decode(row[4]) if row[4] else None,     # date_echeance
+                decode(row[5]) if row[5] else None,     # date_fin
+                decode(row[6])                          # date_creation
+            )
+            for row in rows
+        ]
+
+    def _to_comments(self, rows) -> List[Comment]:
+        """Convertit des lignes (colonnes COMMENT_COLUMNS, dans cet ordre) en commentaires"""
+        decode = self.database.dates.decode
+        from_db = Comment.from_db
+        return [from_db(row[0], row[1], row[2], decode(row[3])) for row in rows]
+
+    # ========== CACHE DES TÂCHES ==========
+
+    @staticmethod
+    def _copy_task(task: Task) -> Task:
+        """Copie d'une tâche du cache (les contrôleurs modifient les tâches reçues)"""
+        return Task.from_db(task.id, task.titre, task.description, task.etat,
+                            task.date_echeance, task.date_fin, task.date_creation)
+
+    def _cache_get(self, task_id: int) -> Optional[Task]:
+        """Retourne une copie de la tâche en cache, ou None"""
+        with self._cache_lock:
+            task = self._cache.get(task_id)
+            if task is None:
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(task_id)
+            self.cache_hits += 1
+        return self._copy_task(task)
+
+    def _cache_put(self, task: Task, generation: int):
+        """
+        Met une tâche en cache, sauf si une écriture a eu lieu depuis la lecture
+        (generation a changé) : la ligne lue est peut-être déjà périmée
+        """
+        with self._cache_lock:
+            if generation != self._cache_generation:
+                return
+            self._cache[task.id] = self._copy_task(task)
+            self._cache.move_to_end(task.id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _cache_invalidate(self, task_ids: Iterable[int] = None):
+        """Retire des tâches du cache (toutes si task_ids est None)"""
+        if not self.cache_size:
+            return
+        if task_ids is not None:
+            task_ids = list(task_ids)
+        pending = getattr(self._tx_local, "pending", None)
+        if pending is not None:
+            pending.update([None] if task_ids is None else task_ids)
+        with self._cache_lock:
+            self._cache_generation += 1
+            if task_ids is None:
+                self._cache.clear()
+            else:
+                for task_id in task_ids:
+                    self._cache.pop(task_id, None)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Compteurs du cache : hits, misses, taille actuelle et maximale"""
+        with self._cache_lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "size": len(self._cache),
+                "max_size": self.cache_size
+            }
+
+    def clear_cache(self):
+        """Vide le cache (les compteurs sont conservés)"""
+        self._cache_invalidate()
+
     # ========== TÂCHES ==========
 
     def create_task(self, task: Task) -> int:
@@ -38,58 +203,114 @@ class Repository:
         Returns:
             L'ID de la tâche créée
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self.database.writer() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                INSERT INTO tasks (titre, description, etat, date_echeance, date_fin, date_creation)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                task.titre,
+                task.description,
+                task.etat,
+                self._encode(task.date_echeance),
+                self._encode(task.date_fin),
+                self._encode(task.date_creation)
+            ))
 
-        cursor.execute("""
-            INSERT INTO tasks (titre, description, etat, date_echeance, date_fin, date_creation)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            task.titre,
-            task.description,
-            task.etat,
-            task.date_echeance.isoformat() if task.date_echeance else None,
-            task.date_fin.isoformat() if task.date_fin else None,
-            task.date_creation.isoformat()
-        ))
-
-        conn.commit()
         task.id = cursor.lastrowid
         return task.id
 
+    def create_tasks_many(self, tasks: Iterable[Task]) -> int:
+        """
+        Insère un lot de tâches avec executemany dans une seule transaction
+        L'itérable est consommé au fil de l'eau (un générateur n'est jamais
+        matérialisé en liste). Si une ligne échoue, rien n'est inséré.
+        Les tâches gardent leur id s'il est renseigné, sinon SQLite en attribue un.
+        Un id déjà présent dans les archives est refusé (sqlite3.IntegrityError,
+        trigger de la migration 9).
+
+        Returns:
+            Le nombre de tâches insérées
+        """
+        rows = (
+            (
+                task.id,
+                task.titre,
+                task.description,
+                task.etat,
+                self._encode(task.date_echeance),
+                self._encode(task.date_fin),
+                self._encode(task.date_creation)
+            )
+            for task in tasks
+        )
+
+        with self.database.writer() as conn:
+            cursor = conn.cursor()
+
+            cursor.executemany("""
+                INSERT INTO tasks (id, titre, description, etat, date_echeance, date_fin, date_creation)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+
+        return cursor.rowcount
+
     def get_all_tasks(self) -> List[Task]:
         """Récupère toutes les tâches"""
         conn = self._get_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT id, titre, description, etat, date_echeance, date_fin, date_creation
+        cursor.execute(f"""
+            SELECT {TASK_COLUMNS}
             FROM tasks
             ORDER BY date_creation DESC
         """)
 
-        tasks = []
-        for row in cursor.fetchall():
-            task = Task(
-                id=row['id'],
-                titre=row['titre'],
-                description=row['description'],
-                etat=row['etat'],
-                date_echeance=datetime.fromisoformat(row['date_echeance']) if row['date_echeance'] else None,
-                date_fin=datetime.fromisoformat(row['date_fin']) if row['date_fin'] else None,
-                date_creation=datetime.fromisoformat(row['date_creation'])
-            )
-            tasks.append(task)
+        return self._to_tasks(cursor.fetchall())
 
-        return tasks
+    def iter_tasks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[Task]:
+        """
+        Parcourt toutes les tâches (par id croissant) sans les charger en mémoire
+        Les lignes sont lues par paquets de chunk_size avec fetchmany
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(f"""
+            SELECT {TASK_COLUMNS}
+            FROM tasks
+            ORDER BY id
+        """)
+
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from self._to_tasks(rows)
+        finally:
+            cursor.close()
 
     def get_task_by_id(self, task_id: int) -> Optional[Task]:
-        """Récupère une tâche par son ID"""
+        """
+        Récupère une tâche par son ID (depuis le cache s'il est activé)
+        Dans une transaction, toujours lue en base : le cache ne voit pas les
+        écritures des autres connexions (cli.py, autre instance) et les
+        contrôleurs y vérifient l'existence de la tâche avant d'écrire
+        """
+        use_cache = self.cache_size and not self.database.in_transaction()
+        if use_cache:
+            task = self._cache_get(task_id)
+            if task is not None:
+                return task
+            generation = self._cache_generation
+
         conn = self._get_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT id, titre, description, etat, date_echeance, date_fin, date_creation
+        cursor.execute(f"""
+            SELECT {TASK_COLUMNS}
             FROM tasks
             WHERE id = ?
         """, (task_id,))
@@ -98,15 +319,10 @@ class Repository:
         if not row:
             return None
 
-        return Task(
-            id=row['id'],
-            titre=row['titre'],
-            description=row['description'],
-            etat=row['etat'],
-            date_echeance=datetime.fromisoformat(row['date_echeance']) if row['date_echeance'] else None,
-            date_fin=datetime.fromisoformat(row['date_fin']) if row['date_fin'] else None,
-            date_creation=datetime.fromisoformat(row['date_creation'])
-        )
+        task = self._to_tasks([row])[0]
+        if use_cache:
+            self._cache_put(task, generation)
+        return task
 
     def update_task(self, task: Task) -> bool:
         """
@@ -118,23 +334,23 @@ class Repository:
         if task.id is None:
             return False
 
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            UPDATE tasks
-            SET titre = ?, description = ?, etat = ?, date_echeance = ?, date_fin = ?
-            WHERE id = ?
-        """, (
-            task.titre,
-            task.description,
-            task.etat,
-            task.date_echeance.isoformat() if task.date_echeance else None,
-            task.date_fin.isoformat() if task.date_fin else None,
-            task.id
-        ))
-
-        conn.commit()
+        with self.database.writer() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                UPDATE tasks
+                SET titre = ?, description = ?, etat = ?, date_echeance = ?, date_fin = ?
+                WHERE id = ?
+            """, (
+                task.titre,
+                task.description,
+                task.etat,
+                self._encode(task.date_echeance),
+                self._encode(task.date_fin),
+                task.id
+            ))
+
+        self._cache_invalidate([task.id])
         return cursor.rowcount > 0
 
     def delete_task(self, task_id: int) -> bool:
@@ -144,40 +360,455 @@ class Repository:
         Returns:
             True si la tâche a été supprimée
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self.database.writer() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-        conn.commit()
+            cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
 
+        self._cache_invalidate([task_id])
         return cursor.rowcount > 0
 
+    def set_tasks_state(self, task_ids: Iterable[int], etat: str, now: datetime) -> int:
+        """
+        Change l'état de plusieurs tâches en une seule requête UPDATE
+        Les tâches déjà dans cet état ne sont pas modifiées.
+        Passage à "Réalisé" : date_fin = now (sauf si déjà renseignée),
+        autre état : date_fin effacée
+
+        Returns:
+            Nombre de tâches modifiées
+        """
+        ids = list(task_ids)
+        if not ids:
+            return 0
+
+        with self.database.writer() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                UPDATE tasks
+                SET etat = ?,
+                    date_fin = CASE WHEN ? = 'Réalisé' THEN COALESCE(date_fin, ?) ELSE NULL END
+                WHERE etat != ? AND id IN (SELECT value FROM json_each(?))
+            """, (etat, etat, self._encode(now), etat, json.dumps(ids)))
+
+        self._cache_invalidate(ids)
+        return cursor.rowcount
+
+    def delete_tasks(self, task_ids: Iterable[int]) -> int:
+        """
+        Supprime plusieurs tâches en une seule requête DELETE
+        (et leurs commentaires via CASCADE)
+
+        Returns:
+            Nombre de tâches supprimées
+        """
+        ids = list(task_ids)
+        if not ids:
+            return 0
+
+        with self.database.writer() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(
+                "DELETE FROM tasks WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(ids),)
+            )
+
+        self._cache_invalidate(ids)
+        return cursor.rowcount
+
     def get_tasks_by_status(self, etat: str) -> List[Task]:
         """Récupère toutes les tâches d'un certain état"""
         conn = self._get_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT id, titre, description, etat, date_echeance, date_fin, date_creation
+        cursor.execute(f"""
+            SELECT {TASK_COLUMNS}
             FROM tasks
             WHERE etat = ?
             ORDER BY date_creation DESC
         """, (etat,))
 
-        tasks = []
+        return self._to_tasks(cursor.fetchall())
+
+    def get_tasks_page(self, after: Optional[PageCursor] = None, limit: int = 100,
+                       etat: Optional[str] = None,
+                       due_start: Optional[datetime] = None,
+                       due_end: Optional[datetime] = None,
+                       exclude_etat: Optional[str] = None) -> Tuple[List[Task], Optional[PageCursor]]:
+        """
+        Récupère une page de tâches triées par date_creation DESC, id DESC
+
+        Pagination par curseur (keyset) : au lieu d'un OFFSET, on repart de la
+        dernière ligne lue. Grâce à l'index (date_creation, id), la page N coûte
+        autant que la page 1.
+
+        Args:
+            after: Curseur retourné par l'appel précédent (None = première page)
+            limit: Nombre maximum de tâches par page
+            etat: Filtre sur l'état, optionnel
+            due_start, due_end: Échéance dans [due_start, due_end[, optionnel
+                (due_end seul = toutes les échéances avant due_end)
+            exclude_etat: État à exclure, optionnel
+
+        Returns:
+            (tâches de la page, curseur de la page suivante ou None si c'est la dernière)
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        conditions = []
+        params = []
+
+        if etat is not None:
+            conditions.append("etat = ?")
+            params.append(etat)
+
+        if due_end is not None and due_start is None:
+            # Intervalle ouvert (onglet Urgent : tout le retard) : l'index sur
+            # date_echeance couvrirait une grande partie de la table, puis un tri
+            # complet. Le "+" l'écarte : on parcourt l'index (date_creation, id)
+            # dans l'ordre de la page et on s'arrête dès qu'elle est pleine.
+            conditions.append("+date_echeance IS NOT NULL AND +date_echeance < ?")
+            params.append(self._encode(due_end))
+        elif due_end is not None:
+            conditions.append("date_echeance IS NOT NULL AND date_echeance < ?")
+            params.append(self._encode(due_end))
+
+        if due_start is not None:
+            conditions.append("date_echeance >= ?")
+            params.append(self._encode(due_start))
+
+        if exclude_etat is not None:
+            conditions.append("etat != ?")
+            params.append(exclude_etat)
+
+        if after is not None:
+            conditions.append("(date_creation, id) < (?, ?)")
+            params.extend(after)
+
+        query = f"""
+            SELECT {TASK_COLUMNS}
+            FROM tasks
+        """
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        # Une ligne de plus que demandé pour savoir s'il reste une page
+        query += " ORDER BY date_creation DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1]['date_creation'], rows[-1]['id'])
+
+        return self._to_tasks(rows), next_cursor
+
+    def get_stats(self, now: datetime) -> dict:
+        """
+        Calcule les statistiques des tâches en une seule requête
+        (GROUP BY état + nombre de tâches en retard par rapport à now)
+
+        Returns:
+            Dictionnaire total / a_faire / en_cours / realise / en_retard
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT etat,
+                   COUNT(*) AS nb,
+                   SUM(date_echeance IS NOT NULL AND date_echeance < ?) AS nb_retard
+            FROM tasks
+            GROUP BY etat
+        """, (self._encode(now),))
+
+        par_etat = {}
+        en_retard = 0
         for row in cursor.fetchall():
-            task = Task(
-                id=row['id'],
-                titre=row['titre'],
-                description=row['description'],
-                etat=row['etat'],
-                date_echeance=datetime.fromisoformat(row['date_echeance']) if row['date_echeance'] else None,
-                date_fin=datetime.fromisoformat(row['date_fin']) if row['date_fin'] else None,
-                date_creation=datetime.fromisoformat(row['date_creation'])
-            )
-            tasks.append(task)
+            par_etat[row['etat']] = row['nb']
+            # Une tâche réalisée n'est jamais en retard
+            if row['etat'] != "Réalisé":
+                en_retard += row['nb_retard']
+
+        return {
+            "total": sum(par_etat.values()),
+            "a_faire": par_etat.get("À faire", 0),
+            "en_cours": par_etat.get("En cours", 0),
+            "realise": par_etat.get("Réalisé", 0),
+            "en_retard": en_retard
+        }
+
+    def get_deadline_columns(self) -> Tuple[array, array, bytearray]:
+        """
+        Échéances de toutes les tâches en colonnes, sans créer de Task :
+        (ids, échéances en secondes epoch ou inf si aucune, 1 si non réalisée)
+        Lecture par blocs de CHUNK_SIZE lignes (voir DeadlineClassifier.classify_columns)
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, date_echeance, etat != 'Réalisé' FROM tasks")
+
+        to_seconds = self.database.dates.to_seconds
+        no_deadline = float("inf")
+        ids, due, is_open = array('q'), array('d'), bytearray()
+        while True:
+            rows = cursor.fetchmany(CHUNK_SIZE)
+            if not rows:
+                break
+            ids.extend(row[0] for row in rows)
+            due.extend(to_seconds(row[1]) if row[1] else no_deadline for row in rows)
+            is_open.extend(row[2] for row in rows)
+
+        return ids, due, is_open
+
+    def get_open_deadlines(self, start: datetime, end: datetime) -> Dict[int, float]:
+        """
+        Échéances dans [start, end[ des tâches non réalisées, sans créer de Task :
+        {id: échéance en secondes epoch} (index sur date_echeance)
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, date_echeance
+            FROM tasks
+            WHERE date_echeance >= ? AND date_echeance < ? AND etat != 'Réalisé'
+        """, (self._encode(start), self._encode(end)))
+
+        to_seconds = self.database.dates.to_seconds
+        return {row[0]: to_seconds(row[1]) for row in cursor.fetchall()}
 
-        return tasks
+    def get_tasks_by_ids(self, task_ids: Iterable[int]) -> List[Task]:
+        """Récupère plusieurs tâches par leurs IDs (les IDs inexistants sont ignorés)"""
+        ids = list(task_ids)
+        if not ids:
+            return []
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(f"""
+            SELECT {TASK_COLUMNS}
+            FROM tasks
+            WHERE id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(ids),))
+
+        return self._to_tasks(cursor.fetchall())
+
+    # ========== JOURNAL DES MODIFICATIONS ==========
+    # Table task_changes remplie par triggers (migration 5) : toute écriture sur
+    # tasks ou comments y laisse une ligne, quel que soit le code qui l'a faite
+
+    def get_last_change_seq(self) -> int:
+        """Numéro de la dernière modification enregistrée (0 si aucune)"""
+        conn = self._get_connection()
+        row = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'task_changes'"
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_changes_since(self, since: int) -> Optional[List[Tuple[int, int, str]]]:
+        """
+        Modifications enregistrées après le numéro since
+
+        Returns:
+            Liste de (seq, task_id, op) dans l'ordre, op parmi I / U / D,
+            ou None si une partie de l'historique a été purgée (il faut tout recharger)
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT seq, task_id, op
+            FROM task_changes
+            WHERE seq > ?
+            ORDER BY seq
+        """, (since,))
+        changes = [tuple(row) for row in cursor.fetchall()]
+
+        # Les numéros AUTOINCREMENT se suivent : un trou signifie une purge
+        if changes:
+            if changes[0][0] != since + 1 or len(changes) != changes[-1][0] - since:
+                self._cache_invalidate()
+                return None
+        elif self.get_last_change_seq() > since:
+            self._cache_invalidate()
+            return None
+
+        # Le journal voit aussi les écritures des autres connexions : le cache les oublie
+        if changes:
+            self._cache_invalidate({task_id for _, task_id, _ in changes})
+        return changes
+
+    def prune_changes(self, upto: int) -> int:
+        """
+        Supprime les modifications jusqu'au numéro upto inclus
+
+        Returns:
+            Nombre de lignes supprimées
+        """
+        with self.database.writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM task_changes WHERE seq <= ?", (upto,))
+
+        return cursor.rowcount
+
+    # ========== RECHERCHE ==========
+
+    @staticmethod
+    def _fts_query(text: str) -> str:
+        """
+        Transforme la saisie de l'utilisateur en requête FTS5
+        Chaque mot est mis entre guillemets (pas de syntaxe FTS5 involontaire :
+        AND, NEAR, "-", ":"...), le dernier mot est un préfixe (recherche à la frappe)
+        """
+        words = ['"' + word.replace('"', '""') + '"' for word in text.split()]
+        if words:
+            words[-1] += "*"
+        return " ".join(words)
+
+    def search(self, text: str, limit: int = SEARCH_LIMIT) -> List[Task]:
+        """
+        Recherche plein texte dans les titres, descriptions et commentaires (FTS5)
+        Tous les mots doivent être présents (dans un même champ indexé).
+        Les tâches sont triées par pertinence (bm25, le titre compte plus que la
+        description), une tâche trouvée via plusieurs champs garde son meilleur score.
+
+        Args:
+            text: Texte saisi (accents et casse ignorés)
+            limit: Nombre maximum de tâches retournées
+        """
+        return self._search(text, limit, "tasks", "comments")
+
+    def _search(self, text: str, limit: int, tasks_table: str, comments_table: str) -> List[Task]:
+        """
+        Requête de search, sur les tables actives ou sur les archives
+        (index FTS : {tasks_table}_fts et {comments_table}_fts)
+        """
+        query = self._fts_query(text)
+        if not query:
+            return []
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        # Chaque branche ne garde que ses `limit` meilleurs résultats : le classement
+        # final n'a plus à joindre/grouper toutes les lignes trouvées
+        cursor.execute(f"""
+            SELECT {TASK_COLUMNS}
+            FROM {tasks_table} AS tasks
+            JOIN (
+                SELECT task_id, MIN(score) AS score
+                FROM (
+                    SELECT * FROM (
+                        SELECT rowid AS task_id, bm25({tasks_table}_fts, 10.0, 1.0) AS score
+                        FROM {tasks_table}_fts
+                        WHERE {tasks_table}_fts MATCH ?
+                        ORDER BY score LIMIT ?
+                    )
+                    UNION ALL
+                    SELECT * FROM (
+                        SELECT comments.task_id, bm25({comments_table}_fts) AS score
+                        FROM {comments_table}_fts
+                        JOIN {comments_table} AS comments ON comments.id = {comments_table}_fts.rowid
+                        WHERE {comments_table}_fts MATCH ?
+                        ORDER BY score LIMIT ?
+                    )
+                )
+                GROUP BY task_id
+            ) AS matches ON matches.task_id = tasks.id
+            ORDER BY matches.score, tasks.id DESC
+            LIMIT ?
+        """, (query, limit, query, limit, limit))
+
+        return self._to_tasks(cursor.fetchall())
+
+    # ========== ARCHIVES ==========
+    # Tables tasks_archive / comments_archive (migration 8) : mêmes colonnes,
+    # hors de toutes les listes, statistiques et recherches par défaut
+
+    def archive_tasks(self, finished_before: datetime,
+                      batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+        """
+        Déplace les tâches réalisées avant finished_before, avec leurs commentaires,
+        vers les tables d'archives
+
+        Une transaction par lot de batch_size tâches : les autres connexions ne
+        sont bloquées que le temps d'un lot, et un arrêt en cours de route laisse
+        chaque tâche soit active soit archivée, jamais les deux
+
+        Une tâche dont l'id est déjà dans les archives (base antérieure à la
+        migration 9) est laissée en place : rien n'est écrasé dans les archives,
+        voir get_archive_conflicts
+
+        Returns:
+            Nombre de tâches archivées
+        """
+        limit = self._encode(finished_before)
+        total = 0
+
+        while True:
+            with self.database.writer() as conn:
+                ids = [row[0] for row in conn.execute("""
+                    SELECT id FROM tasks
+                    WHERE etat = 'Réalisé' AND date_fin IS NOT NULL AND date_fin < ?
+                      AND NOT EXISTS (SELECT 1 FROM tasks_archive WHERE tasks_archive.id = tasks.id)
+                    ORDER BY id
+                    LIMIT ?
+                """, (limit, batch_size))]
+
+                if ids:
+                    ids_json = json.dumps(ids)
+                    conn.execute(f"""
+                        INSERT INTO tasks_archive ({TASK_COLUMNS}, comment_count)
+                        SELECT {TASK_COLUMNS}, comment_count
+                        FROM tasks
+                        WHERE id IN (SELECT value FROM json_each(?))
+                    """, (ids_json,))
+                    conn.execute(f"""
+                        INSERT INTO comments_archive ({COMMENT_COLUMNS})
+                        SELECT {COMMENT_COLUMNS}
+                        FROM comments
+                        WHERE task_id IN (SELECT value FROM json_each(?))
+                    """, (ids_json,))
+                    # Les commentaires suivent via CASCADE
+                    conn.execute(
+                        "DELETE FROM tasks WHERE id IN (SELECT value FROM json_each(?))",
+                        (ids_json,)
+                    )
+
+            if not ids:
+                break
+            self._cache_invalidate(ids)
+            total += len(ids)
+            if len(ids) < batch_size:
+                break
+
+        return total
+
+    def get_archive_conflicts(self, finished_before: datetime) -> List[int]:
+        """IDs des tâches à archiver (comme archive_tasks) dont l'id est déjà dans les archives"""
+        conn = self._get_connection()
+        cursor = conn.execute("""
+            SELECT id FROM tasks
+            WHERE etat = 'Réalisé' AND date_fin IS NOT NULL AND date_fin < ?
+              AND EXISTS (SELECT 1 FROM tasks_archive WHERE tasks_archive.id = tasks.id)
+            ORDER BY id
+        """, (self._encode(finished_before),))
+        return [row[0] for row in cursor.fetchall()]
+
+    def search_archive(self, text: str, limit: int = SEARCH_LIMIT) -> List[Task]:
+        """Recherche plein texte dans les tâches archivées (mêmes règles que search)"""
+        return self._search(text, limit, "tasks_archive", "comments_archive")
+
+    def count_archived_tasks(self) -> int:
+        """Nombre de tâches archivées"""
+        conn = self._get_connection()
+        return conn.execute("SELECT COUNT(*) FROM tasks_archive").fetchone()[0]
 
     # ========== COMMENTAIRES ==========
 
@@ -188,45 +819,190 @@ class Repository:
         Returns:
             L'ID du commentaire créé
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self.database.writer() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                INSERT INTO comments (task_id, texte, date_creation)
+                VALUES (?, ?, ?)
+            """, (
+                comment.task_id,
+                comment.texte,
+                self._encode(comment.date_creation)
+            ))
 
-        cursor.execute("""
-            INSERT INTO comments (task_id, texte, date_creation)
-            VALUES (?, ?, ?)
-        """, (
-            comment.task_id,
-            comment.texte,
-            comment.date_creation.isoformat()
-        ))
-
-        conn.commit()
         comment.id = cursor.lastrowid
         return comment.id
 
+    def create_comments_many(self, comments: Iterable[Comment]) -> int:
+        """
+        Insère un lot de commentaires avec executemany dans une seule transaction
+        (même fonctionnement que create_tasks_many)
+
+        Returns:
+            Le nombre de commentaires insérés
+        """
+        rows = (
+            (
+                comment.id,
+                comment.task_id,
+                comment.texte,
+                self._encode(comment.date_creation)
+            )
+            for comment in comments
+        )
+
+        with self.database.writer() as conn:
+            cursor = conn.cursor()
+
+            cursor.executemany("""
+                INSERT INTO comments (id, task_id, texte, date_creation)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+
+        return cursor.rowcount
+
     def get_comments_by_task(self, task_id: int) -> List[Comment]:
         """Récupère tous les commentaires d'une tâche"""
         conn = self._get_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT id, task_id, texte, date_creation
+        cursor.execute(f"""
+            SELECT {COMMENT_COLUMNS}
             FROM comments
             WHERE task_id = ?
             ORDER BY date_creation DESC
         """, (task_id,))
 
-        comments = []
+        return self._to_comments(cursor.fetchall())
+
+    def get_comments_page(self, task_id: int, after: Optional[PageCursor] = None,
+                          limit: int = 100) -> Tuple[List[Comment], Optional[PageCursor]]:
+        """
+        Récupère une page des commentaires d'une tâche, triés par date_creation DESC, id DESC
+        Pagination par curseur comme get_tasks_page (index task_id, date_creation, id)
+
+        Args:
+            task_id: Tâche dont on lit les commentaires
+            after: Curseur retourné par l'appel précédent (None = première page)
+            limit: Nombre maximum de commentaires par page
+
+        Returns:
+            (commentaires de la page, curseur de la page suivante ou None si c'est la dernière)
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        query = f"""
+            SELECT {COMMENT_COLUMNS}
+            FROM comments
+            WHERE task_id = ?
+        """
+        params = [task_id]
+        if after is not None:
+            query += " AND (date_creation, id) < (?, ?)"
+            params.extend(after)
+        # Une ligne de plus que demandé pour savoir s'il reste une page
+        query += " ORDER BY date_creation DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1]['date_creation'], rows[-1]['id'])
+
+        return self._to_comments(rows), next_cursor
+
+    def iter_comments(self, chunk_size: int = CHUNK_SIZE) -> Iterator[Comment]:
+        """
+        Parcourt tous les commentaires (par id croissant) sans les charger en mémoire
+        Les lignes sont lues par paquets de chunk_size avec fetchmany
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(f"""
+            SELECT {COMMENT_COLUMNS}
+            FROM comments
+            ORDER BY id
+        """)
+
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from self._to_comments(rows)
+        finally:
+            cursor.close()
+
+    def count_comments_by_tasks(self, task_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Nombre de commentaires de plusieurs tâches en une seule requête
+        Lit la colonne tasks.comment_count (tenue à jour par triggers, migration 7) :
+        une recherche par clé primaire par tâche, sans agréger la table comments
+
+        Les IDs sont passés en un seul paramètre JSON (json_each) pour ne pas
+        dépendre de la limite de variables SQLite
+
+        Returns:
+            Dictionnaire {task_id: nombre de commentaires} (0 si aucun)
+        """
+        ids = list(task_ids)
+        counts = dict.fromkeys(ids, 0)
+        if not ids:
+            return counts
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT id, comment_count
+            FROM tasks
+            WHERE id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(ids),))
+
         for row in cursor.fetchall():
-            comment = Comment(
-                id=row['id'],
-                task_id=row['task_id'],
-                texte=row['texte'],
-                date_creation=datetime.fromisoformat(row['date_creation'])
-            )
-            comments.append(comment)
+            counts[row['id']] = row['comment_count']
+
+        return counts
+
+    def check_comment_counts(self, fix: bool = False) -> List[Tuple[int, int, int]]:
+        """
+        Compare tasks.comment_count au vrai nombre de commentaires de chaque tâche
+        (un écart ne peut venir que d'une écriture faite sans les triggers)
+
+        Args:
+            fix: Corrige les compteurs faux (dans une seule transaction)
+
+        Returns:
+            Liste des écarts (task_id, compteur stocké, nombre réel)
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT t.id, t.comment_count, COALESCE(c.nb, 0) AS nb
+            FROM tasks t
+            LEFT JOIN (
+                SELECT task_id, COUNT(*) AS nb FROM comments GROUP BY task_id
+            ) c ON c.task_id = t.id
+            WHERE t.comment_count != COALESCE(c.nb, 0)
+            ORDER BY t.id
+        """)
+        mismatches = [(row[0], row[1], row[2]) for row in cursor.fetchall()]
 
-        return comments
+        if fix and mismatches:
+            with self.database.writer() as conn:
+                conn.executemany(
+                    "UPDATE tasks SET comment_count = ? WHERE id = ?",
+                    [(actual, task_id) for task_id, _, actual in mismatches]
+                )
+
+        return mismatches
 
     def delete_comment(self, comment_id: int) -> bool:
         """
@@ -235,10 +1011,9 @@ class Repository:
         Returns:
             True si le commentaire a été supprimé
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self.database.writer() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("DELETE FROM comments WHERE id = ?", (comment_id,))
-        conn.commit()
+            cursor.execute("DELETE FROM comments WHERE id = ?", (comment_id,))
 
         return cursor.rowcount > 0
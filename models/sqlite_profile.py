@@ -0,0 +1,133 @@
+"""
+SQLiteProfile - Réglages de performance appliqués à chaque connexion SQLite
+Deux préréglages : "safe" (comportement par défaut de SQLite) et "fast"
+"""
+
+import os
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+
+# Fichier .env à la racine du projet
+ENV_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")
+
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+TEMP_STORES = ("DEFAULT", "FILE", "MEMORY")
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    """
+    Ensemble de PRAGMA appliqués à l'ouverture d'une connexion
+
+    cache_size suit la convention SQLite : négatif = taille en Kio, positif = nombre de pages
+    mmap_size est en octets (0 = pas de mmap), busy_timeout en millisecondes
+    """
+    name: str
+    journal_mode: str = "DELETE"
+    synchronous: str = "FULL"
+    cache_size: int = -2000
+    mmap_size: int = 0
+    temp_store: str = "DEFAULT"
+    busy_timeout: int = 5000
+
+    def __post_init__(self):
+        """Validation des valeurs (elles finissent dans des PRAGMA non paramétrables)"""
+        if self.journal_mode.upper() not in JOURNAL_MODES:
+            raise ValueError(f"journal_mode invalide. Doit être parmi : {JOURNAL_MODES}")
+        if self.synchronous.upper() not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"synchronous invalide. Doit être parmi : {SYNCHRONOUS_LEVELS}")
+        if self.temp_store.upper() not in TEMP_STORES:
+            raise ValueError(f"temp_store invalide. Doit être parmi : {TEMP_STORES}")
+        for field_name in ("cache_size", "mmap_size", "busy_timeout"):
+            if not isinstance(getattr(self, field_name), int):
+                raise ValueError(f"{field_name} doit être un entier")
+
+    def pragmas(self) -> Dict[str, str]:
+        """Retourne les PRAGMA à exécuter, dans l'ordre"""
+        return {
+            "journal_mode": self.journal_mode.upper(),
+            "synchronous": self.synchronous.upper(),
+            "cache_size": str(self.cache_size),
+            "mmap_size": str(self.mmap_size),
+            "temp_store": self.temp_store.upper(),
+            "busy_timeout": str(self.busy_timeout),
+        }
+
+
+PROFILES = {
+    # Valeurs par défaut de SQLite : journal classique et fsync à chaque commit
+    "safe": SQLiteProfile(name="safe"),
+    # WAL + synchronous NORMAL : un seul fsync au checkpoint au lieu de chaque commit,
+    # gros cache et lecture par mmap. Une coupure de courant peut perdre les
+    # derniers commits mais ne corrompt pas la base.
+    "fast": SQLiteProfile(
+        name="fast",
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        cache_size=-65536,       # 64 Mio
+        mmap_size=268435456,     # 256 Mio
+        temp_store="MEMORY",
+        busy_timeout=5000,
+    ),
+}
+
+# Variables d'environnement (ou du .env) surchargeant un champ du profil
+ENV_OVERRIDES = {
+    "DB_JOURNAL_MODE": ("journal_mode", str),
+    "DB_SYNCHRONOUS": ("synchronous", str),
+    "DB_CACHE_SIZE": ("cache_size", int),
+    "DB_MMAP_SIZE": ("mmap_size", int),
+    "DB_TEMP_STORE": ("temp_store", str),
+    "DB_BUSY_TIMEOUT": ("busy_timeout", int),
+}
+
+
+def read_env_file(path: str = ENV_FILE) -> Dict[str, str]:
+    """
+    Lit un fichier .env simple (lignes CLE=VALEUR, # pour les commentaires)
+    Retourne un dictionnaire vide si le fichier n'existe pas
+    """
+    values = {}
+    if not os.path.exists(path):
+        return values
+
+    with open(path, encoding="utf-8") as env_file:
+        for line in env_file:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            values[key.strip()] = value.strip().strip('"').strip("'")
+
+    return values
+
+
+def get_profile(name: str) -> SQLiteProfile:
+    """Retourne un préréglage par son nom ("safe" ou "fast")"""
+    try:
+        return PROFILES[name.lower()]
+    except KeyError:
+        raise ValueError(f"Profil SQLite inconnu : {name}. Doit être parmi : {list(PROFILES)}")
+
+
+def profile_from_env(env: Optional[Dict[str, str]] = None) -> SQLiteProfile:
+    """
+    Construit le profil depuis l'environnement
+    DB_PROFILE choisit le préréglage (défaut "safe"), les DB_* le surchargent
+    Les variables d'environnement ont priorité sur le fichier .env
+    """
+    if env is None:
+        env = {**read_env_file(), **os.environ}
+
+    profile = get_profile(env.get("DB_PROFILE", "safe"))
+
+    overrides = {}
+    for key, (field_name, cast) in ENV_OVERRIDES.items():
+        if env.get(key):
+            try:
+                overrides[field_name] = cast(env[key])
+            except ValueError:
+                raise ValueError(f"Valeur invalide pour {key} : {env[key]}")
+
+    return replace(profile, **overrides) if overrides else profile
@@ -7,12 +7,18 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+# États possibles d'une tâche (tuple construit une seule fois)
+ETATS_VALIDES = ("À faire", "En cours", "Réalisé")
 
-@dataclass
+
+@dataclass(slots=True)
 class Task:
     """
     Une tâche avec tous ses attributs
     J'ai mis id en Optional parce qu'il sera None avant insertion en base
+
+    slots=True : pas de __dict__ par instance, nettement moins de mémoire
+    quand on charge des centaines de milliers de tâches
     """
     titre: str
     description: str
@@ -24,16 +30,37 @@ class Task:
     
     def __post_init__(self):
         """Validation basique après création"""
-        etats_valides = ["À faire", "En cours", "Réalisé"]
-        if self.etat not in etats_valides:
-            raise ValueError(f"État invalide. Doit être parmi : {etats_valides}")
+        if self.etat not in ETATS_VALIDES:
+            raise ValueError(f"État invalide. Doit être parmi : {list(ETATS_VALIDES)}")
+
+    @classmethod
+    def from_db(cls, id: int, titre: str, description: str, etat: str,
+                date_echeance: Optional[datetime], date_fin: Optional[datetime],
+                date_creation: datetime) -> "Task":
+        """
+        Construction rapide sans validation, réservée aux lignes lues en base
+        (elles ont déjà été validées à l'écriture)
+        """
+        task = object.__new__(cls)
+        task.id = id
+        task.titre = titre
+        task.description = description
+        task.etat = etat
+        task.date_echeance = date_echeance
+        task.date_fin = date_fin
+        task.date_creation = date_creation
+        return task
     
     def est_terminee(self) -> bool:
         """Check rapide pour savoir si la tâche est finie"""
         return self.etat == "Réalisé"
     
-    def est_en_retard(self) -> bool:
-        """Vérifie si la date d'échéance est dépassée"""
+    def est_en_retard(self, now: Optional[datetime] = None) -> bool:
+        """
+        Vérifie si la date d'échéance est dépassée
+        now : instant de référence (par défaut maintenant), à passer pour comparer
+        plusieurs tâches au même instant
+        """
         if not self.date_echeance or self.est_terminee():
             return False
-        return datetime.now() > self.date_echeance
+        return (now or datetime.now()) > self.date_echeance
@@ -44,7 +44,7 @@ QPushButton:disabled {
 }
 
 /* === TABLEAU === */
-QTableWidget {
+QTableView {
     background-color: #1e1e2e;
     alternate-background-color: #181825;
     gridline-color: #313244;
@@ -53,25 +53,25 @@ QTableWidget {
     font-size: 11pt;  /* ✅ Légèrement plus petit pour les cellules */
 }
 
-QTableWidget::item {
+QTableView::item {
     color: #cdd6f4;
     padding: 10px;  /* ✅ Plus d'espace */
 }
 
 
-QTableWidget::item:focus {
+QTableView::item:focus {
     outline: none;
     border: none;
 }
 
 /* ✅ Survol : fond gris moyen + texte BLANC */
-QTableWidget::item:hover {
+QTableView::item:hover {
     background-color: #585b70;
     color: #ffffff;
 }
 
 /* ✅ Sélection : fond bleu vif + texte NOIR */
-QTableWidget::item:selected {
+QTableView::item:selected {
     background-color: #89b4fa;
     color: #181825;
     font-weight: bold;
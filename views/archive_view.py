@@ -0,0 +1,131 @@
+"""
+ArchiveView - Recherche dans les tâches archivées
+Les archives ne sont lues qu'à la demande : aucun onglet ni statistique ne les parcourt
+"""
+
+from typing import List
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
+    QLineEdit, QLabel, QTableView, QHeaderView, QAbstractItemView
+)
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+
+from controllers.task_controller import TaskController
+from models.task import Task
+
+
+class ArchiveTableModel(QAbstractTableModel):
+    """Résultats d'une recherche dans les archives (lecture seule, par pertinence)"""
+
+    HEADERS = ["ID", "Titre", "Échéance", "Réalisée le", "Créée le"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tasks: List[Task] = []
+
+    def set_tasks(self, tasks: List[Task]):
+        """Remplace les résultats affichés"""
+        self.beginResetModel()
+        self._tasks = tasks
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._tasks)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+
+        task = self._tasks[index.row()]
+        column = index.column()
+        if column == 0:
+            return str(task.id)
+        if column == 1:
+            return task.titre
+        if column == 2:
+            return task.date_echeance.strftime("%d/%m/%Y") if task.date_echeance else "-"
+        if column == 3:
+            return task.date_fin.strftime("%d/%m/%Y") if task.date_fin else "-"
+        if column == 4:
+            return task.date_creation.strftime("%d/%m/%Y")
+        return None
+
+
+class ArchiveView(QDialog):
+    """
+    Fenêtre modale de recherche plein texte dans les archives
+    (titres, descriptions et commentaires des tâches archivées)
+    """
+
+    def __init__(self, task_controller: TaskController, parent=None):
+        super().__init__(parent)
+
+        self.task_ctrl = task_controller
+
+        self.setWindowTitle("🗄️ Archives")
+        self.setModal(True)
+        self.setMinimumSize(800, 500)
+
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Construit l'interface"""
+        layout = QVBoxLayout(self)
+
+        total = self.task_ctrl.count_archived_tasks()
+        info_label = QLabel(f"🗄️ {total} tâche(s) archivée(s)")
+        info_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(info_label)
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔍 Rechercher dans les archives...")
+        self.search_input.setClearButtonEnabled(True)
+        layout.addWidget(self.search_input)
+
+        # Recherche lancée 250 ms après la dernière frappe (comme la fenêtre principale)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self._on_search)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.search_input.returnPressed.connect(self._on_search)
+
+        self.result_model = ArchiveTableModel(self)
+        self.result_table = QTableView()
+        self.result_table.setModel(self.result_model)
+        self.result_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.result_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.result_table.setAlternatingRowColors(True)
+        self.result_table.verticalHeader().setVisible(False)
+        header = self.result_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)  # Titre
+        layout.addWidget(self.result_table)
+
+        self.label_results = QLabel("")
+        layout.addWidget(self.label_results)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.btn_close = QPushButton("❌ Fermer")
+        self.btn_close.clicked.connect(self.accept)
+        button_layout.addWidget(self.btn_close)
+        layout.addLayout(button_layout)
+
+    def _on_search(self):
+        """Affiche les tâches archivées correspondant à la saisie"""
+        self.search_timer.stop()
+        text = self.search_input.text().strip()
+
+        tasks = self.task_ctrl.search_archive(text) if text else []
+        self.result_model.set_tasks(tasks)
+        self.label_results.setText(f"{len(tasks)} résultat(s)" if text else "")
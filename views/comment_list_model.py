@@ -0,0 +1,86 @@
+"""
+CommentListModel - Modèle Qt de la liste des commentaires d'une tâche
+Les commentaires sont lus par pages (plus récents d'abord) au fil du défilement :
+ouvrir une tâche qui en a des milliers ne lit que la première page
+"""
+
+from typing import List, Optional
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+from controllers.comment_controller import CommentController
+from models.comment import Comment
+
+
+class CommentListModel(QAbstractListModel):
+    """
+    Commentaires d'une tâche, chargés page par page (canFetchMore / fetchMore)
+    Remplace les QListWidgetItem : le texte est calculé seulement pour les lignes affichées
+    """
+
+    def __init__(self, task_id: int, comment_controller: CommentController, parent=None):
+        super().__init__(parent)
+
+        self.task_id = task_id
+        self.comment_ctrl = comment_controller
+
+        self._comments: List[Comment] = []
+        self._next_cursor = None
+        self._loaded = False  # Première page lue ?
+
+    def reload(self):
+        """Repart de la première page (après un ajout ou une suppression)"""
+        comments, next_cursor = self.comment_ctrl.get_comments_page(self.task_id)
+
+        self.beginResetModel()
+        self._comments = comments
+        self._next_cursor = next_cursor
+        self._loaded = True
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        """La vue demande la suite quand on arrive en bas de la liste"""
+        return not parent.isValid() and self._loaded and self._next_cursor is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Ajoute la page suivante à la fin de la liste"""
+        if not self.canFetchMore(parent):
+            return
+
+        comments, self._next_cursor = self.comment_ctrl.get_comments_page(
+            self.task_id, self._next_cursor
+        )
+        if not comments:
+            return
+
+        first = len(self._comments)
+        self.beginInsertRows(QModelIndex(), first, first + len(comments) - 1)
+        self._comments.extend(comments)
+        self.endInsertRows()
+
+    def comment_at(self, row: int) -> Optional[Comment]:
+        """Retourne le commentaire de la ligne row (None si la ligne n'existe pas)"""
+        if 0 <= row < len(self._comments):
+            return self._comments[row]
+        return None
+
+    # ========== INTERFACE QAbstractListModel ==========
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._comments)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        """Texte d'un commentaire, calculé seulement quand la vue l'affiche"""
+        if not index.isValid():
+            return None
+
+        comment = self._comments[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            date_str = comment.date_creation.strftime("%d/%m/%Y %H:%M")
+            return f"[{date_str}] {comment.texte}"
+
+        if role == Qt.ItemDataRole.UserRole:
+            return comment.id  # ID du commentaire (suppression)
+
+        return None
@@ -1,16 +1,18 @@
 """
 CommentView - Affiche et gère les commentaires d'une tâche
+La liste est une vue sur CommentListModel : les commentaires sont lus par pages au défilement
 """
 
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
-    QListWidget, QListWidgetItem, QTextEdit, QLabel,
+    QListView, QTextEdit, QLabel,
     QMessageBox
 )
 from PySide6.QtCore import Qt
 
 from controllers.comment_controller import CommentController
 from controllers.task_controller import TaskController
+from views.comment_list_model import CommentListModel
 
 
 class CommentView(QDialog):
@@ -53,9 +55,19 @@ class CommentView(QDialog):
         comments_label.setStyleSheet("font-weight: bold; margin-top: 10px;")
         layout.addWidget(comments_label)
         
-        self.comment_list = QListWidget()
+        self.comment_model = CommentListModel(self.task_id, self.comment_ctrl, self)
+
+        self.comment_list = QListView()
+        self.comment_list.setModel(self.comment_model)
         self.comment_list.setAlternatingRowColors(True)
+        self.comment_list.setUniformItemSizes(True)  # Une ligne par commentaire : pas de mesure par ligne
         layout.addWidget(self.comment_list)
+
+        self.label_empty = QLabel("Aucun commentaire pour le moment.")
+        self.label_empty.setStyleSheet("color: gray;")
+        self.label_empty.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
+        self.label_empty.hide()
+        layout.addWidget(self.label_empty, 1)  # Prend la place de la liste vide
         
         # === ZONE D'AJOUT ===
         add_label = QLabel("✍️ Ajouter un commentaire :")
@@ -88,38 +100,21 @@ class CommentView(QDialog):
         layout.addLayout(button_layout)
         
         # Activer le bouton supprimer si sélection
-        self.comment_list.itemSelectionChanged.connect(self._on_selection_changed)
+        self.comment_list.selectionModel().selectionChanged.connect(self._on_selection_changed)
     
     def _load_comments(self):
-        """Charge les commentaires de la tâche"""
-        self.comment_list.clear()
-        
-        comments = self.comment_ctrl.get_comments_for_task(self.task_id)
-        
-        if not comments:
-            item = QListWidgetItem("Aucun commentaire pour le moment.")
-            item.setForeground(Qt.GlobalColor.gray)
-            self.comment_list.addItem(item)
-            return
-        
-        for comment in comments:
-            date_str = comment.date_creation.strftime("%d/%m/%Y %H:%M")
-            text = f"[{date_str}] {comment.texte}"
-            
-            item = QListWidgetItem(text)
-            item.setData(Qt.ItemDataRole.UserRole, comment.id)  # Stocke l'ID du commentaire
-            self.comment_list.addItem(item)
+        """Charge la première page des commentaires (la suite vient au défilement)"""
+        self.comment_model.reload()
+        self.btn_delete.setEnabled(False)
+
+        empty = self.comment_model.rowCount() == 0
+        self.comment_list.setVisible(not empty)
+        self.label_empty.setVisible(empty)
     
     def _on_selection_changed(self):
         """Active/désactive le bouton supprimer selon la sélection"""
-        has_selection = len(self.comment_list.selectedItems()) > 0
-        # Ne pas permettre la suppression du message "Aucun commentaire"
-        if has_selection:
-            selected_item = self.comment_list.currentItem()
-            has_valid_selection = selected_item.data(Qt.ItemDataRole.UserRole) is not None
-            self.btn_delete.setEnabled(has_valid_selection)
-        else:
-            self.btn_delete.setEnabled(False)
+        has_selection = self.comment_list.selectionModel().hasSelection()
+        self.btn_delete.setEnabled(has_selection)
     
     def _on_add_comment(self):
         """Ajoute un nouveau commentaire"""
@@ -140,11 +135,11 @@ class CommentView(QDialog):
 
     def _on_delete_comment(self):
         """Supprime le commentaire sélectionné"""
-        selected_item = self.comment_list.currentItem()
-        if not selected_item:
+        selected = self.comment_list.selectionModel().selectedIndexes()
+        if not selected:
             return
         
-        comment_id = selected_item.data(Qt.ItemDataRole.UserRole)
+        comment_id = selected[0].data(Qt.ItemDataRole.UserRole)
         if not comment_id:
             return
         
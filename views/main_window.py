@@ -1,21 +1,36 @@
 """
 MainWindow - Fenêtre principale avec vues multiples
 Onglets : Aujourd'hui | Cette semaine | Ce mois | Urgent | Toutes
+Les onglets partagent un seul modèle de tâches (un proxy filtrant par onglet)
+Recherche plein texte : résultats affichés dans l'onglet Toutes
+Les lectures longues (rechargement, recherche, statistiques) tournent dans un QThreadPool
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
+from typing import List, Optional
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-    QPushButton, QTableWidget, QTableWidgetItem, QLabel,
-    QComboBox, QMessageBox, QHeaderView, QTabWidget, QInputDialog
+    QPushButton, QTableView, QAbstractItemView, QLabel,
+    QComboBox, QMessageBox, QHeaderView, QTabWidget, QInputDialog, QLineEdit
 )
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QColor, QBrush
+from PySide6.QtCore import Qt, Signal, QTimer, QThreadPool
 
-from controllers.task_controller import TaskController
+from controllers.task_controller import TaskController, PAGE_SIZE
 from controllers.comment_controller import CommentController
+from controllers.deadline_classifier import DeadlineClassifier, TAB_BUCKETS
+from views.task_table_model import TaskTableModel, TaskFilterProxyModel
+from views.task_delegate import TaskItemDelegate
+from views.workers import Worker
 from styles.app_style import APP_STYLESHEET
 
+# Modifications gardées dans le journal derrière la dernière affichée :
+# une autre instance moins à jour continue en incrémental. La purge est
+# faite par paquets de cette taille (une écriture toutes les N modifications).
+CHANGES_KEPT = 1000
+
+# Délai avant de retenter le rechargement du changement de jour s'il a échoué
+RELOAD_RETRY_MS = 60_000
+
 
 class MainWindow(QMainWindow):
     """
@@ -31,6 +46,30 @@ class MainWindow(QMainWindow):
         self.comment_ctrl = comment_controller
         self.current_view = "all"
 
+        # Modèle partagé par les onglets (chargé par _load_tasks)
+        self.task_model = TaskTableModel(self.task_ctrl, self.comment_ctrl, self)
+        self.task_delegate = TaskItemDelegate(self)  # Badge d'état et retard, partagé par les onglets
+
+        # Dernière modification déjà affichée (journal task_changes, voir _apply_changes)
+        self._change_seq = 0
+        self._pruned_seq = 0  # Journal purgé jusqu'à ce numéro (voir _prune_changes)
+
+        # Lectures en arrière-plan : chaque demande a un numéro de génération,
+        # le résultat d'une demande remplacée par une plus récente est ignoré
+        self._load_generation = 0
+        self._search_generation = 0
+        self._stats_generation = 0
+        self._stats_pending = False  # Un calcul des statistiques est en cours
+        self._stats: Optional[dict] = None  # Statistiques affichées
+        self._workers = set()  # garde les workers en vie jusqu'à leur résultat
+
+        # Un seul minuteur, programmé sur la prochaine échéance (ou minuit) :
+        # pas de rafraîchissement périodique, voir _schedule_deadline
+        self.deadline_timer = QTimer(self)
+        self.deadline_timer.setSingleShot(True)
+        self.deadline_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.deadline_timer.timeout.connect(self._on_deadline)
+
         self.setWindowTitle("📋 Gestionnaire de Tâches Pro")
         self.setGeometry(100, 100, 1200, 700)
         
@@ -62,18 +101,47 @@ class MainWindow(QMainWindow):
             stats_layout.addWidget(label)
 
         stats_layout.addStretch()
+
+        # Indicateur de chargement en arrière-plan
+        self.label_loading = QLabel("⏳ Chargement...")
+        self.label_loading.setStyleSheet("padding: 8px; font-size: 13px;")
+        self.label_loading.hide()
+        stats_layout.addWidget(self.label_loading)
+
+        # === RECHERCHE ===
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔍 Rechercher (titre, description, commentaires)...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setMinimumWidth(320)
+        stats_layout.addWidget(self.search_input)
+
+        # Recherche lancée après une courte pause de frappe (pas à chaque touche)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self._on_search)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.search_input.returnPressed.connect(self._on_search)
+
         main_layout.addLayout(stats_layout)
 
         # === ONGLETS ===
         self.tabs = QTabWidget()
         self.tabs.currentChanged.connect(self._on_tab_changed)
 
-        # Créer les 5 onglets
-        self.table_today = self._create_table()
-        self.table_week = self._create_table()
-        self.table_month = self._create_table()
-        self.table_urgent = self._create_table()
+        # Créer les 5 onglets (compartiment d'échéance de chaque onglet daté)
+        self.table_today = self._create_table(TAB_BUCKETS["today"])
+        self.table_week = self._create_table(TAB_BUCKETS["week"])
+        self.table_month = self._create_table(TAB_BUCKETS["month"])
+        self.table_urgent = self._create_table(TAB_BUCKETS["urgent"])
         self.table_all = self._create_table()
+        self._tables = {
+            "today": self.table_today,
+            "week": self.table_week,
+            "month": self.table_month,
+            "urgent": self.table_urgent,
+            "all": self.table_all
+        }
 
         self.tabs.addTab(self.table_today, "📅 Aujourd'hui")
         self.tabs.addTab(self.table_week, "📆 Cette semaine")
@@ -92,6 +160,7 @@ class MainWindow(QMainWindow):
         self.btn_close = QPushButton("✅ Clôturer")
         self.btn_change_state = QPushButton("🔄 Changer l'état")
         self.btn_comments = QPushButton("💬 Commentaires")
+        self.btn_archives = QPushButton("🗄️ Archives")
 
         self.btn_add.clicked.connect(self._on_add_task)
         self.btn_edit.clicked.connect(self._on_edit_task)
@@ -99,21 +168,25 @@ class MainWindow(QMainWindow):
         self.btn_close.clicked.connect(self._on_close_task) 
         self.btn_change_state.clicked.connect(self._on_change_state)
         self.btn_comments.clicked.connect(self._on_show_comments)
+        self.btn_archives.clicked.connect(self._on_show_archives)
 
         for btn in [self.btn_add, self.btn_edit, self.btn_delete, 
-                    self.btn_change_state, self.btn_comments, self.btn_close]:
+                    self.btn_change_state, self.btn_comments, self.btn_close, self.btn_archives]:
             btn_layout.addWidget(btn)
 
         btn_layout.addStretch()
         main_layout.addLayout(btn_layout)
 
-    def _create_table(self) -> QTableWidget:
-        """Crée un tableau standardisé pour toutes les vues"""
-        table = QTableWidget()
-        table.setColumnCount(7)
-        table.setHorizontalHeaderLabels([
-            "ID", "Titre", "État", "Échéance", "💬", "Priorité", "Retard"
-        ])
+    def _create_table(self, bucket: Optional[int] = None) -> QTableView:
+        """
+        Crée un tableau standardisé pour toutes les vues
+        bucket : compartiment d'échéance affiché (None pour l'onglet Toutes)
+        """
+        table = QTableView()
+
+        # Vue filtrée du modèle partagé (l'onglet Toutes le charge au défilement)
+        table.setModel(TaskFilterProxyModel(self.task_model, bucket, parent=table))
+        table.setItemDelegate(self.task_delegate)
 
         # Configuration du header
         header = table.horizontalHeader()
@@ -125,167 +198,275 @@ class MainWindow(QMainWindow):
         header.setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)  # Priorité
         header.setSectionResizeMode(6, QHeaderView.ResizeMode.ResizeToContents)  # Retard
 
-        table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)  # Ctrl/Maj + clic
         table.setAlternatingRowColors(True)
         table.verticalHeader().setVisible(False)
 
          # ✅ DÉSACTIVER LE FOCUS MOCHE
         table.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
 
         # Double-clic pour éditer
-        table.itemDoubleClicked.connect(self._on_row_double_clicked)
+        table.doubleClicked.connect(self._on_row_double_clicked)
 
         return table
 
-    def _get_current_table(self) -> QTableWidget:
+    def _get_current_table(self) -> QTableView:
         """Retourne le tableau de l'onglet actif"""
         index = self.tabs.currentIndex()
         return [self.table_today, self.table_week, self.table_month, 
                 self.table_urgent, self.table_all][index]
 
     def _on_tab_changed(self, index: int):
-        """Callback quand on change d'onglet"""
+        """Callback quand on change d'onglet (déjà chargé : aucune requête)"""
         views = ["today", "week", "month", "urgent", "all"]
         self.current_view = views[index]
-        self._load_tasks()
+
+    def _start_worker(self, worker: Worker, on_finished, on_failed):
+        """
+        Lance un Worker dans le pool de threads (sa connexion SQLite est fermée à la fin)
+        on_finished / on_failed reçoivent la génération du worker : chaque type de
+        worker (chargement, recherche, statistiques) a son propre compteur
+        """
+        worker.cleanup = self.task_ctrl.close_thread_connection
+        self._workers.add(worker)
+
+        def finished(generation, result):
+            self._workers.discard(worker)
+            on_finished(generation, result)
+
+        def failed(generation, message):
+            self._workers.discard(worker)
+            on_failed(generation, message)
+
+        worker.signals.finished.connect(finished)
+        worker.signals.failed.connect(failed)
+        QThreadPool.globalInstance().start(worker)
+
+    def _show_worker_error(self, message: str):
+        """Erreur de lecture en arrière-plan"""
+        QMessageBox.warning(self, "⚠️ Attention", f"Erreur de chargement :\n{message}")
+
+    def _on_load_failed(self, generation: int, message: str):
+        """Échec d'un rechargement (ignoré si un autre a été lancé depuis)"""
+        if generation != self._load_generation:
+            return
+        self.label_loading.hide()
+        if self.task_model.clock.now.date() != datetime.now().date():
+            # Rechargement du changement de jour : le minuteur n'est plus armé,
+            # _on_deadline le retentera (pas tout de suite : minuit est déjà passé)
+            self.deadline_timer.start(RELOAD_RETRY_MS)
+        self._show_worker_error(message)
 
     def _load_tasks(self):
-        """Charge les tâches selon la vue active"""
-        
-        # Récupération des tâches filtrées
-        if self.current_view == "today":
-            tasks = self._filter_today()
-            table = self.table_today
-        elif self.current_view == "week":
-            tasks = self._filter_week()
-            table = self.table_week
-        elif self.current_view == "month":
-            tasks = self._filter_month()
-            table = self.table_month
-        elif self.current_view == "urgent":
-            tasks = self._filter_urgent()
-            table = self.table_urgent
-        else:
-            tasks = self.task_ctrl.get_all_tasks()
-            table = self.table_all
-
-        # Remplissage du tableau
-        table.setRowCount(len(tasks))
-
-        for row, task in enumerate(tasks):
-            # ID
-            table.setItem(row, 0, QTableWidgetItem(str(task.id)))
-
-            # Titre
-            table.setItem(row, 1, QTableWidgetItem(task.titre))
-
-            # État avec émoji + couleur de fond
-            etat_display = {
-                "À faire": "📝 À faire",
-                "En cours": "⚙️ En cours",
-                "Réalisé": "✅ Réalisé"
-                }
-
-            etat_item = QTableWidgetItem(etat_display.get(task.etat, task.etat))
-            etat_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-            if task.etat == "À faire":
-                etat_item.setBackground(QColor("#AC1313"))  # Rouge vif
-                etat_item.setForeground(QColor("#1e1e2e"))  # Texte noir
-
-            elif task.etat == "En cours":
-                etat_item.setBackground(QColor("#b35419"))  # Orange vif
-                etat_item.setForeground(QColor("#1e1e2e"))
-
-            elif task.etat == "Réalisé":
-                etat_item.setBackground(QColor("#16640f"))  # Vert vif
-                etat_item.setForeground(QColor("#1e1e2e"))
-
- 
-            table.setItem(row, 2, etat_item)
-
-            # Échéance
-            if task.date_echeance:
-                echeance_str = task.date_echeance.strftime("%d/%m/%Y")
-                echeance_item = QTableWidgetItem(echeance_str)
-                if task.est_en_retard():
-                    echeance_item.setForeground(QColor("#f38ba8"))
-                table.setItem(row, 3, echeance_item)
-            else:
-                table.setItem(row, 3, QTableWidgetItem("-"))
-
-            # Commentaires
-            nb_comments = len(self.comment_ctrl.get_comments_for_task(task.id))
-            table.setItem(row, 4, QTableWidgetItem(str(nb_comments)))
-
-            # Priorité
-            priorite = "🔥 Haute" if task.est_en_retard() else "Normal"
-            priorite_item = QTableWidgetItem(priorite)
-            if task.est_en_retard():
-                priorite_item.setForeground(QColor("#f38ba8"))
-            table.setItem(row, 5, priorite_item)
-
-            # Retard
-            retard_item = QTableWidgetItem("⚠️ OUI" if task.est_en_retard() else "")
-            if task.est_en_retard():
-                retard_item.setForeground(QColor("#f38ba8"))
-            table.setItem(row, 6, retard_item)
-
-        # Mise à jour des statistiques
+        """Recharge le modèle partagé, donc tous les onglets (en arrière-plan)"""
+
+        # Un seul instant de référence pour les onglets datés, le retard et les statistiques
+        clock = DeadlineClassifier()
+        search = self.search_input.text().strip()
+
+        self._load_generation += 1
+        self.label_loading.show()
+
+        worker = Worker(self._load_generation, self._fetch_tasks,
+                        self._load_generation, clock, search)
+        self._start_worker(worker, self._on_tasks_loaded, self._on_load_failed)
+
+    def _fetch_tasks(self, generation: int, clock: DeadlineClassifier, search: str):
+        """
+        Lectures d'un rechargement complet (thread de travail : aucun widget ici)
+        Abandonne dès qu'un rechargement plus récent a été demandé
+        """
+        def cancelled():
+            return generation != self._load_generation
+
+        # Lu avant le chargement : une modification concurrente sera réappliquée
+        change_seq = self.task_ctrl.get_last_change_seq()
+
+        data = self.task_model.fetch_data(clock, cancelled)
+        if data is None or cancelled():
+            return None
+
+        return {
+            "change_seq": change_seq,
+            "data": data,
+            "search": search,
+            "results": self.task_ctrl.search(search) if search else None,
+            "stats": self.task_ctrl.get_stats(clock.now)
+        }
+
+    def _on_tasks_loaded(self, generation: int, result):
+        """Affiche le résultat d'un rechargement (thread de l'interface)"""
+        if generation != self._load_generation or result is None:
+            return  # Rechargement périmé
+
+        self._change_seq = result["change_seq"]
+        self.task_model.reset(result["data"])
+        self._prune_changes()
+
+        self.task_model.set_search(result["results"])
+        self.table_all.model().refilter()
+        if result["search"] != self.search_input.text().strip():
+            self._run_search()  # Le texte a changé pendant le chargement
+
+        self._show_stats(result["stats"])
+        self.label_loading.hide()
+        self._schedule_deadline()
+
+        # Modifications faites pendant le chargement
+        if self.task_ctrl.get_last_change_seq() != self._change_seq:
+            self._apply_changes()
+
+    def _on_search(self):
+        """Affiche les résultats de la recherche dans l'onglet Toutes"""
+        self.search_timer.stop()
+        self._run_search()
+        if self.search_input.text().strip() and self.current_view != "all":
+            self.tabs.setCurrentWidget(self.table_all)
+
+    def _run_search(self):
+        """Passe l'onglet Toutes en résultats de recherche (ou l'en sort si le champ est vide)"""
+        search = self.search_input.text().strip()
+        self._search_generation += 1
+
+        if not search:
+            if self.task_model.search_ranks is not None:
+                self._on_search_results(self._search_generation, None)
+            return
+
+        worker = Worker(self._search_generation, self.task_ctrl.search, search)
+        self._start_worker(worker, self._on_search_results, self._on_search_failed)
+
+    def _on_search_results(self, generation: int, tasks):
+        """Affiche les résultats d'une recherche (ignorés si une autre a été lancée depuis)"""
+        if generation != self._search_generation:
+            return
+
+        self.task_model.set_search(tasks)
+        self.table_all.model().refilter()
+
+    def _on_search_failed(self, generation: int, message: str):
+        """Échec d'une recherche (ignoré si une autre a été lancée depuis)"""
+        if generation == self._search_generation:
+            self._show_worker_error(message)
+
+    def _apply_changes(self):
+        """
+        Rafraîchit les onglets d'après le journal des modifications :
+        seules les lignes des tâches ajoutées, modifiées ou supprimées sont touchées
+        """
+        seq, changed = self.task_ctrl.get_changes_since(self._change_seq)
+
+        # Historique purgé ou trop de modifications : un rechargement complet est plus simple
+        if changed is None or len(changed) > PAGE_SIZE:
+            self._load_tasks()
+            return
+
+        self._change_seq = seq
+        if changed:
+            self.task_model.apply_changes(changed)
+            self._prune_changes()
+            # Les résultats de recherche peuvent avoir changé
+            self._run_search()
+            # Une échéance ajoutée ou modifiée peut être la prochaine à passer
+            self._schedule_deadline()
+
         self._update_stats()
 
-    def _filter_today(self):
-        """Tâches avec échéance aujourd'hui"""
-        all_tasks = self.task_ctrl.get_all_tasks()
-        today = datetime.now().date()
-        return [t for t in all_tasks if t.date_echeance and t.date_echeance.date() == today]
-
-    def _filter_week(self):
-        """Tâches de la semaine en cours"""
-        all_tasks = self.task_ctrl.get_all_tasks()
-        today = datetime.now().date()
-        week_end = today + timedelta(days=7)
-        return [t for t in all_tasks if t.date_echeance and today <= t.date_echeance.date() <= week_end]
-
-    def _filter_month(self):
-        """Tâches du mois en cours"""
-        all_tasks = self.task_ctrl.get_all_tasks()
-        today = datetime.now()
-        return [t for t in all_tasks if t.date_echeance and 
-                t.date_echeance.month == today.month and 
-                t.date_echeance.year == today.year]
-
-    def _filter_urgent(self):
-        """Tâches en retard ou échéance < 3 jours"""
-        all_tasks = self.task_ctrl.get_all_tasks()
-        today = datetime.now().date()
-        limit = today + timedelta(days=3)
-        return [t for t in all_tasks if t.date_echeance and 
-                t.date_echeance.date() <= limit and t.etat != "Réalisé"]
+    def _prune_changes(self):
+        """
+        Purge le journal en gardant les CHANGES_KEPT modifications qui précèdent
+        la dernière affichée, et seulement quand CHANGES_KEPT de plus peuvent
+        partir : pas d'écriture supplémentaire à chaque action, et le journal
+        reste borné pendant la session.
+        Une autre instance en retard de plus de CHANGES_KEPT verra le trou et rechargera tout.
+        """
+        upto = self._change_seq - CHANGES_KEPT
+        if upto - self._pruned_seq >= CHANGES_KEPT:
+            self.task_ctrl.prune_changes(upto)
+            self._pruned_seq = upto
+
+    def _schedule_deadline(self):
+        """Programme le minuteur sur la prochaine échéance du modèle, ou sur minuit"""
+        midnight = datetime.combine(self.task_model.clock.now.date() + timedelta(days=1), time.min)
+        next_time = midnight.timestamp()
+
+        next_due = self.task_model.next_deadline()
+        if next_due is not None:
+            next_time = min(next_time, next_due)
+
+        # +1 ms : une tâche n'est en retard qu'une fois son échéance strictement dépassée
+        delay = max(0, int((next_time - datetime.now().timestamp()) * 1000) + 1)
+        self.deadline_timer.start(delay)
+
+    def _on_deadline(self):
+        """
+        Une échéance (ou minuit) vient de passer : seules les lignes des tâches
+        passées en retard sont redessinées et le compteur de retard avancé
+        d'autant, sans recalcul des statistiques
+        """
+        now = datetime.now()
+        if now.date() != self.task_model.clock.now.date():
+            # Nouveau jour : les onglets datés changent de période (reprogrammé à la fin du chargement)
+            self._load_tasks()
+            return
+
+        passed = self.task_model.advance_clock(now)
+        if passed:
+            if self._stats is None or self._stats_pending:
+                # Un calcul en cours a été lancé avec l'ancien instant de référence
+                self._update_stats()
+            else:
+                # Tâches non réalisées, en retard depuis cet instant (déjà urgentes :
+                # le compartiment Urgent ne change qu'au changement de jour)
+                self._show_stats(dict(self._stats, en_retard=self._stats["en_retard"] + len(passed)))
+        self._schedule_deadline()
 
     def _update_stats(self):
+        """Recalcule la barre de statistiques (en arrière-plan)"""
+        self._stats_generation += 1
+        self._stats_pending = True
+        worker = Worker(self._stats_generation, self.task_ctrl.get_stats, self.task_model.clock.now)
+        self._start_worker(worker, self._on_stats_loaded, self._on_stats_failed)
+
+    def _on_stats_loaded(self, generation: int, stats: dict):
+        """Affiche les statistiques calculées par _update_stats"""
+        if generation == self._stats_generation:
+            self._stats_pending = False
+            self._show_stats(stats)
+
+    def _on_stats_failed(self, generation: int, message: str):
+        """Échec du calcul des statistiques (la prochaine modification le relance)"""
+        if generation == self._stats_generation:
+            self._stats_pending = False
+            self._show_worker_error(message)
+
+    def _show_stats(self, stats: dict):
         """Met à jour la barre de statistiques"""
-        stats = self.task_ctrl.get_stats()
-
+        self._stats = stats
         self.label_total.setText(f"📊 Total : {stats['total']}")
         self.label_a_faire.setText(f"📝 À faire : {stats['a_faire']}")
         self.label_en_cours.setText(f"⚙️ En cours : {stats['en_cours']}")
         self.label_realise.setText(f"✅ Réalisé : {stats['realise']}")
         self.label_retard.setText(f"⚠️ En retard : {stats['en_retard']}")
 
-    def _get_selected_task_id(self) -> int:
-        """Retourne l'ID de la tâche sélectionnée"""
+    def _get_selected_task_ids(self) -> List[int]:
+        """Retourne les IDs des tâches sélectionnées (dans l'ordre du tableau)"""
         table = self._get_current_table()
-        selected_rows = table.selectionModel().selectedRows()
+        selected_rows = sorted(index.row() for index in table.selectionModel().selectedRows())
 
         if not selected_rows:
             QMessageBox.warning(self, "⚠️ Attention", "Aucune tâche sélectionnée !")
-            return 0
+            return []
+
+        model = table.model()
+        return [model.task_at(row).id for row in selected_rows]
 
-        row = selected_rows[0].row()
-        return int(table.item(row, 0).text())
+    def _get_selected_task_id(self) -> int:
+        """Retourne l'ID de la tâche sélectionnée (la première si plusieurs)"""
+        task_ids = self._get_selected_task_ids()
+        return task_ids[0] if task_ids else 0
 
     def _on_add_task(self):
         """Ouvre le formulaire de création"""
@@ -293,7 +474,7 @@ class MainWindow(QMainWindow):
 
         dialog = TaskFormView(self.task_ctrl, parent=self)
         if dialog.exec():
-            self._load_tasks()
+            self._apply_changes()
 
     def _on_edit_task(self):
         """Ouvre le formulaire d'édition"""
@@ -305,62 +486,66 @@ class MainWindow(QMainWindow):
 
         dialog = TaskFormView(self.task_ctrl, task_id=task_id, parent=self)
         if dialog.exec():
-            self._load_tasks()
+            self._apply_changes()
 
     def _on_delete_task(self):
-        """Supprime la tâche sélectionnée"""
-        task_id = self._get_selected_task_id()
-        if not task_id:
+        """Supprime les tâches sélectionnées"""
+        task_ids = self._get_selected_task_ids()
+        if not task_ids:
             return
 
-        task = self.task_ctrl.get_task_by_id(task_id)
+        if len(task_ids) == 1:
+            task = self.task_ctrl.get_task_by_id(task_ids[0])
+            question = f"Voulez-vous vraiment supprimer la tâche :\n\n« {task.titre} » ?"
+        else:
+            question = f"Voulez-vous vraiment supprimer les {len(task_ids)} tâches sélectionnées ?"
 
         reply = QMessageBox.question(
             self,
             "❓ Confirmer la suppression",
-            f"Voulez-vous vraiment supprimer la tâche :\n\n« {task.titre} » ?",
+            question,
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.task_ctrl.delete_task(task_id)
-            QMessageBox.information(self, "✅ Succès", "Tâche supprimée !")
-            self._load_tasks()
+            count = self.task_ctrl.delete_tasks(task_ids)
+            message = "Tâche supprimée !" if count == 1 else f"{count} tâches supprimées !"
+            QMessageBox.information(self, "✅ Succès", message)
+            self._apply_changes()
 
     def _on_change_state(self):
-        """Change l'état de la tâche"""
-        task_id = self._get_selected_task_id()
-        if not task_id:
+        """Change l'état des tâches sélectionnées"""
+        task_ids = self._get_selected_task_ids()
+        if not task_ids:
             return
 
-        task = self.task_ctrl.get_task_by_id(task_id)
-
         etats = ["À faire", "En cours", "Réalisé"]
+
+        if len(task_ids) == 1:
+            task = self.task_ctrl.get_task_by_id(task_ids[0])
+            label = f"Nouvel état pour « {task.titre} » :"
+            current = etats.index(task.etat)
+        else:
+            label = f"Nouvel état pour les {len(task_ids)} tâches sélectionnées :"
+            current = 0
+
         nouvel_etat, ok = QInputDialog.getItem(
             self,
             "🔄 Changer l'état",
-            f"Nouvel état pour « {task.titre} » :",
+            label,
             etats,
-            etats.index(task.etat),
+            current,
             False
         )
 
         if ok and nouvel_etat:
-            # Appel avec titre + description
-            self.task_ctrl.update_task(
-                task_id, 
-                titre=task.titre,
-                description=task.description,
-                etat=nouvel_etat,
-                date_echeance=task.date_echeance
-            )
+            # Une seule requête pour toute la sélection
+            self.task_ctrl.change_states(task_ids, nouvel_etat)
             QMessageBox.information(self, "✅ Succès", f"État changé en « {nouvel_etat} » !")
-            self._load_tasks()
+            self._apply_changes()
 
     def _on_show_comments(self):
         """Affiche les commentaires de la tâche"""
-        print("🔍 _on_show_comments appelé")
-
         task_id = self._get_selected_task_id()
         if not task_id:
             return
@@ -369,39 +554,60 @@ class MainWindow(QMainWindow):
 
         dialog = CommentView(task_id, self.task_ctrl, self.comment_ctrl, parent=self)
         dialog.exec()
-        self._load_tasks()
+        self._apply_changes()
+
+    def _on_show_archives(self):
+        """Ouvre la recherche dans les tâches archivées"""
+        from views.archive_view import ArchiveView
+
+        dialog = ArchiveView(self.task_ctrl, parent=self)
+        dialog.exec()
     
     def _on_close_task(self):
-        """Clôture rapide de la tâche sélectionnée"""
-        task_id = self._get_selected_task_id()
-        if not task_id:
+        """Clôture rapide des tâches sélectionnées"""
+        task_ids = self._get_selected_task_ids()
+        if not task_ids:
             return
 
-        task = self.task_ctrl.get_task_by_id(task_id)
+        if len(task_ids) == 1:
+            task = self.task_ctrl.get_task_by_id(task_ids[0])
 
-        if task.etat == "Réalisé":
-            QMessageBox.information(self, "ℹ️ Information", "Cette tâche est déjà clôturée.")
-            return
+            if task.etat == "Réalisé":
+                QMessageBox.information(self, "ℹ️ Information", "Cette tâche est déjà clôturée.")
+                return
+
+            question = f"Voulez-vous vraiment clôturer la tâche :\n\n« {task.titre} » ?"
+        else:
+            question = f"Voulez-vous vraiment clôturer les {len(task_ids)} tâches sélectionnées ?"
 
         reply = QMessageBox.question(
             self,
             "❓ Confirmer la clôture",
-            f"Voulez-vous vraiment clôturer la tâche :\n\n« {task.titre} » ?",
+            question,
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            try:
-                self.task_ctrl.close_task(task_id)
-                QMessageBox.information(self, "✅ Succès", "Tâche clôturée !")
-                self._load_tasks()
-            except ValueError as e:
-                QMessageBox.warning(self, "⚠️ Attention", str(e))
+            # Les tâches déjà clôturées sont ignorées
+            count = self.task_ctrl.close_tasks(task_ids)
+            if count == 0:
+                QMessageBox.information(self, "ℹ️ Information", "Ces tâches sont déjà clôturées.")
+                return
+            message = "Tâche clôturée !" if count == 1 else f"{count} tâches clôturées !"
+            QMessageBox.information(self, "✅ Succès", message)
+            self._apply_changes()
 
     def _on_row_double_clicked(self):
         """Double-clic = édition"""
         self._on_edit_task()
 
+    def closeEvent(self, event):
+        """Attend la fin des lectures en cours avant de fermer (la base va être fermée)"""
+        self.deadline_timer.stop()
+        self._load_generation += 1  # Les rechargements en cours s'arrêtent au plus tôt
+        QThreadPool.globalInstance().waitForDone()
+        super().closeEvent(event)
+
     def refresh(self):
         """Méthode publique pour rafraîchir depuis l'extérieur"""
-        self._load_tasks()
+        self._apply_changes()
@@ -0,0 +1,99 @@
+"""
+Delegate de la table des tâches - Dessine le badge d'état et les marqueurs de retard
+Les pinceaux sont créés une seule fois : seul le dessin des cellules visibles coûte
+"""
+
+from PySide6.QtCore import Qt, QModelIndex, QRect, QRectF
+from PySide6.QtGui import QBrush, QColor, QPainter, QPen
+from PySide6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+from views.task_table_model import COLUMN_ETAT, COLUMNS_RETARD, ETAT_ROLE, EN_RETARD_ROLE
+
+# Couleur de fond du badge selon l'état
+ETAT_COLORS = {
+    "À faire": "#AC1313",   # Rouge vif
+    "En cours": "#b35419",  # Orange vif
+    "Réalisé": "#16640f"    # Vert vif
+}
+BADGE_TEXT_COLOR = "#1e1e2e"   # Texte noir
+RETARD_TEXT_COLOR = "#f38ba8"  # Texte rouge des tâches en retard
+
+
+class TaskItemDelegate(QStyledItemDelegate):
+    """
+    Delegate partagé par les tables de la fenêtre principale
+
+    Colonne état : badge arrondi coloré selon ETAT_ROLE
+    Colonnes échéance / priorité / en retard : texte en rouge si EN_RETARD_ROLE
+    Les autres cellules gardent le rendu standard (et la feuille de style)
+    """
+
+    BADGE_MARGIN = 4
+    BADGE_RADIUS = 6
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Créés une fois pour toutes, réutilisés à chaque dessin
+        self._badge_brushes = {etat: QBrush(QColor(color)) for etat, color in ETAT_COLORS.items()}
+        self._badge_pen = QPen(QColor(BADGE_TEXT_COLOR))
+        self._retard_pen = QPen(QColor(RETARD_TEXT_COLOR))
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        column = index.column()
+
+        if column == COLUMN_ETAT:
+            brush = self._badge_brushes.get(index.data(ETAT_ROLE))
+            if brush is not None:
+                self._paint_badge(painter, option, index, brush)
+                return
+        elif column in COLUMNS_RETARD and index.data(EN_RETARD_ROLE):
+            # En sélection, le texte garde la couleur de la feuille de style
+            if not option.state & QStyle.StateFlag.State_Selected:
+                self._paint_text(painter, option, index, self._retard_pen)
+                return
+
+        super().paint(painter, option, index)
+
+    def _draw_background(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        """Dessine le fond standard de la cellule (survol, sélection) sans texte"""
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        text = opt.text
+        opt.text = ""
+        widget = opt.widget
+        style = widget.style() if widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, widget)
+        return opt, text, style
+
+    def _paint_badge(self, painter: QPainter, option: QStyleOptionViewItem,
+                     index: QModelIndex, brush: QBrush):
+        """Badge arrondi coloré avec le libellé de l'état centré"""
+        opt, text, _ = self._draw_background(painter, option, index)
+        rect = QRectF(opt.rect).adjusted(self.BADGE_MARGIN, self.BADGE_MARGIN,
+                                         -self.BADGE_MARGIN, -self.BADGE_MARGIN)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(brush)
+        painter.drawRoundedRect(rect, self.BADGE_RADIUS, self.BADGE_RADIUS)
+        painter.setPen(self._badge_pen)
+        painter.setFont(opt.font)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+
+    def _paint_text(self, painter: QPainter, option: QStyleOptionViewItem,
+                    index: QModelIndex, pen: QPen):
+        """Fond standard puis texte dans la couleur du stylo, tronqué si besoin"""
+        opt, text, style = self._draw_background(painter, option, index)
+        # Marges horizontales du style, mais toute la hauteur de la cellule :
+        # le padding de la feuille de style rognerait le texte verticalement
+        text_rect = style.subElementRect(QStyle.SubElement.SE_ItemViewItemText, opt, opt.widget)
+        rect = QRect(text_rect.left(), opt.rect.top(), text_rect.width(), opt.rect.height())
+        elided = opt.fontMetrics.elidedText(text, Qt.TextElideMode.ElideRight, rect.width())
+
+        painter.save()
+        painter.setPen(pen)
+        painter.setFont(opt.font)
+        painter.drawText(rect, int(opt.displayAlignment), elided)
+        painter.restore()
@@ -0,0 +1,471 @@
+"""
+TaskTableModel - Modèle Qt des tableaux de tâches
+Un seul modèle partagé par les cinq onglets, chaque onglet étant un
+TaskFilterProxyModel (filtre sur les compartiments d'échéance) : changer
+d'onglet ne coûte aucune requête et une modification met à jour tous les onglets.
+
+Le modèle contient, triées par date_creation DESC, id DESC :
+- les pages déjà lues de chaque onglet (un curseur keyset par onglet,
+  canFetchMore / fetchMore) : un rechargement lit une page par onglet
+- les résultats de la recherche en cours
+Les cellules sont calculées à la demande : seules les lignes affichées coûtent quelque chose
+Chaque tâche est classée une fois (DeadlineClassifier, même instant pour toutes)
+à son entrée dans le modèle : onglets et retard sont de simples tests de bits.
+Quand une échéance passe, advance_clock ne reclasse que les tâches concernées.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+
+from controllers.task_controller import TaskController
+from controllers.comment_controller import CommentController
+from controllers.deadline_classifier import DeadlineClassifier, DeadlineQueue, TAB_BUCKETS, OVERDUE
+from models.task import Task
+
+
+# Affichage de l'état avec émoji
+ETAT_DISPLAY = {
+    "À faire": "📝 À faire",
+    "En cours": "⚙️ En cours",
+    "Réalisé": "✅ Réalisé"
+}
+
+# Colonnes particulières (les couleurs sont dessinées par TaskItemDelegate)
+COLUMN_ETAT = 2
+COLUMNS_RETARD = (3, 5, 6)  # Texte en rouge quand la tâche est en retard
+
+# Rôles de données lus par TaskItemDelegate
+ETAT_ROLE = Qt.ItemDataRole.UserRole + 1       # État brut ("À faire"...)
+EN_RETARD_ROLE = Qt.ItemDataRole.UserRole + 2  # True si la tâche est en retard
+
+
+def _sort_key(task: Task):
+    """Clé du tri des tableaux (appliqué en ordre décroissant)"""
+    return (task.date_creation, task.id)
+
+
+@dataclass
+class TabPages:
+    """
+    Pagination d'un onglet : filtres SQL (get_tasks_page), curseur de la page
+    suivante et clé de tri de la dernière tâche lue (None = tout est chargé)
+    """
+    filters: dict = field(default_factory=dict)
+    next_cursor: object = None
+    boundary: object = None
+
+    def is_loaded(self, task: Task) -> bool:
+        """True si la tâche est avant la fin des pages déjà lues"""
+        return self.boundary is None or _sort_key(task) >= self.boundary
+
+
+@dataclass
+class TaskModelData:
+    """Données d'un rechargement complet du modèle (lues par fetch_data)"""
+    clock: DeadlineClassifier
+    tasks: List[Task]
+    flags: Dict[int, int]
+    deadlines: DeadlineQueue
+    comment_counts: Dict[int, int]
+    pages: Dict[Optional[int], TabPages]
+
+
+class TaskTableModel(QAbstractTableModel):
+    """
+    Modèle des tâches partagé par tous les onglets (plus récentes d'abord)
+    Remplace les QTableWidgetItem : aucune cellule n'est créée à l'avance
+    """
+
+    HEADERS = ["ID", "Titre", "État", "Échéance", "💬", "Priorité", "Retard"]
+
+    def __init__(self, task_controller: TaskController,
+                 comment_controller: CommentController, parent=None):
+        super().__init__(parent)
+
+        self.task_ctrl = task_controller
+        self.comment_ctrl = comment_controller
+
+        self._tasks: List[Task] = []
+        self._comment_counts: Dict[int, int] = {}
+
+        # Instant de référence et compartiments d'échéance de chaque tâche {id: bits}
+        self._clock = DeadlineClassifier()
+        self._flags: Dict[int, int] = {}
+        # Échéances pas encore passées à _clock.now de toutes les tâches non
+        # réalisées du jour, chargées ou non (minuteur et compteur de retard)
+        self._deadlines = DeadlineQueue()
+
+        # Pagination de chaque onglet : {compartiment (None = Toutes): TabPages}
+        self._pages: Dict[Optional[int], TabPages] = {
+            bucket: TabPages() for bucket in (None, *TAB_BUCKETS.values())
+        }
+
+        # Recherche en cours : {id: rang de pertinence}, None hors recherche
+        self._search_ranks: Optional[Dict[int, int]] = None
+
+    # ========== CHARGEMENT ==========
+
+    def fetch_data(self, clock: DeadlineClassifier,
+                   cancelled: Callable[[], bool] = lambda: False) -> Optional[TaskModelData]:
+        """
+        Lit les données d'un rechargement sans toucher au modèle :
+        peut être appelé depuis un thread de travail (voir reset)
+        Retourne None si cancelled() devient vrai entre deux requêtes
+        """
+        tab_filters = clock.tab_filters()
+        filters_by_bucket = {None: {}}
+        filters_by_bucket.update((TAB_BUCKETS[name], filters) for name, filters in tab_filters.items())
+
+        tasks = {}
+        pages = {}
+        for bucket, filters in filters_by_bucket.items():
+            pages[bucket] = TabPages(filters)
+            self._read_page(pages[bucket], tasks)
+            if cancelled():
+                return None
+
+        # Toutes les échéances du jour, pas seulement celles des tâches chargées
+        deadlines = DeadlineQueue()
+        deadlines.reset(self.task_ctrl.get_open_deadlines(clock.now, tab_filters["today"]["due_end"]))
+
+        return TaskModelData(
+            clock=clock,
+            tasks=sorted(tasks.values(), key=_sort_key, reverse=True),
+            flags=clock.classify(tasks.values()),
+            deadlines=deadlines,
+            comment_counts=self.comment_ctrl.count_comments_for_tasks(tasks),
+            pages=pages
+        )
+
+    def _read_page(self, pages: TabPages, tasks: Dict[int, Task]) -> List[Task]:
+        """Lit la page suivante d'un onglet, avance son curseur et ajoute ses tâches à tasks"""
+        page, pages.next_cursor = self.task_ctrl.get_tasks_page(pages.next_cursor, **pages.filters)
+        if pages.next_cursor is None:
+            pages.boundary = None
+        elif page:
+            pages.boundary = _sort_key(page[-1])
+
+        tasks.update((task.id, task) for task in page)
+        return page
+
+    def reset(self, data: TaskModelData):
+        """Remplace le contenu du modèle (thread de l'interface uniquement)"""
+        self.beginResetModel()
+
+        self._clock = data.clock
+        self._tasks = data.tasks
+        self._flags = data.flags
+        self._deadlines = data.deadlines
+        self._comment_counts = data.comment_counts
+        self._pages = data.pages
+        self._search_ranks = None
+
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        """Le modèle seul se comporte comme l'onglet Toutes"""
+        return not parent.isValid() and self.can_fetch_more(None)
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Ajoute la page suivante de l'onglet Toutes"""
+        if not parent.isValid():
+            self.fetch_more(None)
+
+    def can_fetch_more(self, bucket: Optional[int]) -> bool:
+        """True s'il reste des pages à lire pour l'onglet bucket (None = Toutes)"""
+        return self._pages[bucket].next_cursor is not None
+
+    def fetch_more(self, bucket: Optional[int]):
+        """
+        Ajoute la page suivante d'un onglet (appelé par son proxy quand la
+        vue arrive en bas du tableau)
+        """
+        if not self.can_fetch_more(bucket):
+            return
+
+        page = self._read_page(self._pages[bucket], {})
+
+        # Tâches déjà présentes (autres onglets) : elles entrent dans cet onglet
+        rows = self._rows_by_id()
+        for task in page:
+            if task.id in rows:
+                self._emit_row_changed(rows[task.id])
+
+        self._insert_tasks([task for task in page if task.id not in rows])
+
+    def set_search(self, tasks: Optional[List[Task]]):
+        """
+        Affiche des résultats de recherche (triés par pertinence) dans l'onglet Toutes
+        None pour quitter la recherche
+        """
+        if tasks is None:
+            self._search_ranks = None
+            return
+
+        self._search_ranks = {task.id: rank for rank, task in enumerate(tasks)}
+
+        rows = self._rows_by_id()
+        for task in tasks:
+            if task.id in rows:
+                self._tasks[rows[task.id]] = task
+                self._track([task])
+                self._emit_row_changed(rows[task.id])
+        self._insert_tasks([task for task in tasks if task.id not in rows])
+
+    @property
+    def search_ranks(self) -> Optional[Dict[int, int]]:
+        """Rangs de pertinence de la recherche en cours (None hors recherche)"""
+        return self._search_ranks
+
+    @property
+    def clock(self) -> DeadlineClassifier:
+        """Instant de référence des compartiments d'échéance affichés"""
+        return self._clock
+
+    def next_deadline(self) -> Optional[float]:
+        """Prochaine échéance d'une tâche non réalisée, chargée ou non (secondes epoch), None si aucune"""
+        return self._deadlines.next_due()
+
+    def advance_clock(self, now: datetime) -> List[int]:
+        """
+        Avance l'instant de référence à now, dans la même journée (un changement
+        de jour décale les onglets datés : recharger avec MainWindow._load_tasks)
+        Seules les tâches dont l'échéance vient de passer sont reclassées et
+        redessinées (les proxies refiltrent ces lignes). Retourne leurs ids,
+        tâches chargées ou non : toutes sont désormais en retard.
+        """
+        self._clock = DeadlineClassifier(now)
+        passed = self._deadlines.pop_passed(now)
+        if passed:
+            rows = self._rows_by_id()
+            for task_id in passed:
+                row = rows.get(task_id)
+                if row is not None:
+                    self._flags[task_id] = self._clock.flags(self._tasks[row])
+                    self._emit_row_changed(row)
+        return passed
+
+    def is_shown_in(self, bucket: Optional[int], task: Task) -> bool:
+        """
+        True si l'onglet bucket (None = Toutes, hors recherche) affiche la tâche :
+        elle est dans son compartiment et dans les pages déjà lues de l'onglet
+        """
+        if bucket is not None and not self._flags.get(task.id, 0) & bucket:
+            return False
+        return self._pages[bucket].is_loaded(task)
+
+    def task_at(self, row: int) -> Task:
+        """Retourne la tâche affichée à la ligne row"""
+        return self._tasks[row]
+
+    # ========== MISE À JOUR INCRÉMENTALE ==========
+
+    def apply_changes(self, changed: Dict[int, Optional[Task]]):
+        """
+        Applique des tâches modifiées ({id: tâche ou None si supprimée}, voir
+        TaskController.get_changes_since) sans recharger le modèle
+        Les onglets (proxies) refiltrent seulement les lignes touchées
+        """
+        # Échéances suivies pour toutes les tâches modifiées, chargées ou non
+        for task_id, task in changed.items():
+            if task is None:
+                self._deadlines.discard(task_id)
+            else:
+                self._deadlines.update(task, self._clock.now)
+
+        rows = self._rows_by_id()
+        kept = {
+            task_id: task for task_id, task in changed.items()
+            if task is not None and (task_id in rows or self._is_wanted(task))
+        }
+
+        # 1. Suppressions (du bas vers le haut pour ne pas décaler les lignes restantes)
+        removed = [rows[task_id] for task_id in changed if task_id in rows and task_id not in kept]
+        for row in sorted(removed, reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            task = self._tasks.pop(row)
+            self._comment_counts.pop(task.id, None)
+            self._flags.pop(task.id, None)
+            self.endRemoveRows()
+        if removed:
+            rows = self._rows_by_id()
+
+        self._comment_counts.update(self.comment_ctrl.count_comments_for_tasks(kept))
+
+        # 2. Modifications sur place (date_creation ne change pas : même position)
+        for task in kept.values():
+            row = rows.get(task.id)
+            if row is not None:
+                self._tasks[row] = task
+                self._track([task])
+                self._emit_row_changed(row)
+
+        # 3. Insertions à leur place dans le tri
+        self._insert_tasks([task for task in kept.values() if task.id not in rows])
+
+    def _is_wanted(self, task: Task) -> bool:
+        """True si la tâche doit être dans le modèle (un onglet au moins l'affiche)"""
+        flags = self._clock.flags(task)
+        return any(
+            pages.is_loaded(task) and (bucket is None or flags & bucket)
+            for bucket, pages in self._pages.items()
+        )
+
+    def _insert_tasks(self, tasks: List[Task]):
+        """Insère des tâches absentes du modèle à leur place dans le tri"""
+        if not tasks:
+            return
+
+        self._comment_counts.update(self.comment_ctrl.count_comments_for_tasks(
+            task.id for task in tasks if task.id not in self._comment_counts
+        ))
+        self._track(tasks)
+
+        # Les tâches consécutives dans le tri sont insérées en un seul bloc
+        tasks = sorted(tasks, key=_sort_key, reverse=True)
+        offset = 0
+        while offset < len(tasks):
+            row = self._insert_position(tasks[offset])
+            end = offset + 1
+            while end < len(tasks) and self._insert_position(tasks[end]) == row:
+                end += 1
+
+            self.beginInsertRows(QModelIndex(), row, row + end - offset - 1)
+            self._tasks[row:row] = tasks[offset:end]
+            self.endInsertRows()
+            offset = end
+
+    def _track(self, tasks: List[Task]):
+        """Classe des tâches nouvelles ou modifiées et suit leur prochaine échéance"""
+        self._flags.update(self._clock.classify(tasks))
+        for task in tasks:
+            self._deadlines.update(task, self._clock.now)
+
+    def _insert_position(self, task: Task) -> int:
+        """Ligne où insérer une tâche (tri date_creation DESC, id DESC), par dichotomie"""
+        key = _sort_key(task)
+
+        low, high = 0, len(self._tasks)
+        while low < high:
+            middle = (low + high) // 2
+            if _sort_key(self._tasks[middle]) > key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _rows_by_id(self) -> Dict[int, int]:
+        """Index {id de tâche: ligne}"""
+        return {task.id: row for row, task in enumerate(self._tasks)}
+
+    def _emit_row_changed(self, row: int):
+        """Prévient les vues (et les proxies) qu'une ligne a changé"""
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+    # ========== INTERFACE QAbstractTableModel ==========
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._tasks)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        """Valeur d'une cellule, calculée seulement quand la vue l'affiche"""
+        if not index.isValid():
+            return None
+
+        task = self._tasks[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._display(task, column)
+
+        if role == ETAT_ROLE:
+            return task.etat
+
+        if role == EN_RETARD_ROLE:
+            return bool(self._flags.get(task.id, 0) & OVERDUE)
+
+        if role == Qt.ItemDataRole.TextAlignmentRole and column == COLUMN_ETAT:
+            return Qt.AlignmentFlag.AlignCenter
+
+        return None
+
+    def _display(self, task: Task, column: int) -> str:
+        """Texte affiché dans une cellule"""
+        if column == 0:
+            return str(task.id)
+        if column == 1:
+            return task.titre
+        if column == COLUMN_ETAT:
+            return ETAT_DISPLAY.get(task.etat, task.etat)
+        if column == 3:
+            return task.date_echeance.strftime("%d/%m/%Y") if task.date_echeance else "-"
+        if column == 4:
+            return str(self._comment_counts.get(task.id, 0))
+        if column == 5:
+            return "🔥 Haute" if self._flags.get(task.id, 0) & OVERDUE else "Normal"
+        if column == 6:
+            return "⚠️ OUI" if self._flags.get(task.id, 0) & OVERDUE else ""
+        return None
+
+
+class TaskFilterProxyModel(QSortFilterProxyModel):
+    """
+    Un onglet : les lignes du modèle partagé qui sont dans son compartiment,
+    parmi les pages déjà lues pour cet onglet (chargé au défilement)
+    bucket = bit de DeadlineClassifier (onglets datés), None pour l'onglet Toutes
+    (qui affiche aussi les résultats de recherche, triés par pertinence)
+    """
+
+    def __init__(self, source: TaskTableModel, bucket: Optional[int] = None, parent=None):
+        super().__init__(parent)
+        self._bucket = bucket
+        self.setSourceModel(source)
+
+    def refilter(self):
+        """Réapplique le filtre (et le tri par pertinence en recherche)"""
+        self.invalidateFilter()
+        searching = self._bucket is None and self.sourceModel().search_ranks is not None
+        # Colonne -1 : ordre du modèle source (date de création)
+        self.sort(0 if searching else -1)
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        source = self.sourceModel()
+        task = source.task_at(source_row)
+        if self._bucket is None and source.search_ranks is not None:
+            return task.id in source.search_ranks
+        return source.is_shown_in(self._bucket, task)
+
+    def lessThan(self, left: QModelIndex, right: QModelIndex) -> bool:
+        """Tri par pertinence (utilisé seulement pendant une recherche)"""
+        source = self.sourceModel()
+        ranks = source.search_ranks or {}
+        return (ranks.get(source.task_at(left.row()).id, 0)
+                < ranks.get(source.task_at(right.row()).id, 0))
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        """Chaque onglet lit ses propres pages (pas l'onglet Toutes pendant une recherche)"""
+        source = self.sourceModel()
+        if parent.isValid() or (self._bucket is None and source.search_ranks is not None):
+            return False
+        return source.can_fetch_more(self._bucket)
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Ajoute la page suivante de cet onglet au modèle partagé"""
+        if self.canFetchMore(parent):
+            self.sourceModel().fetch_more(self._bucket)
+
+    def task_at(self, row: int) -> Task:
+        """Retourne la tâche affichée à la ligne row de l'onglet"""
+        source_index = self.mapToSource(self.index(row, 0))
+        return self.sourceModel().task_at(source_index.row())
@@ -0,0 +1,55 @@
+"""
+Workers - Exécution des lectures longues hors du thread de l'interface
+Le résultat revient par signal Qt, traité dans le thread de l'interface
+"""
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+
+class WorkerSignals(QObject):
+    """
+    Signaux d'un Worker (un QRunnable ne peut pas en porter lui-même)
+    generation identifie la demande : l'appelant ignore les résultats périmés
+    """
+
+    finished = Signal(int, object)  # generation, résultat
+    failed = Signal(int, str)       # generation, message d'erreur
+
+
+class Worker(QRunnable):
+    """
+    Exécute fn(*args, **kwargs) dans un QThreadPool
+
+    Exemple :
+        worker = Worker(generation, task_ctrl.search, "texte")
+        worker.cleanup = task_ctrl.close_thread_connection
+        worker.signals.finished.connect(self._on_results)
+        QThreadPool.globalInstance().start(worker)
+
+    fn ne doit pas toucher aux widgets ni aux modèles Qt : uniquement des lectures
+    (le Repository ouvre une connexion SQLite par thread). cleanup est appelé
+    dans le thread du worker une fois fn terminée, même en cas d'erreur :
+    c'est là que la connexion ouverte par fn est fermée.
+    """
+
+    def __init__(self, generation: int, fn, *args, **kwargs):
+        super().__init__()
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.cleanup = None  # ex : task_ctrl.close_thread_connection
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            print(f"❌ Erreur pendant le chargement : {e}")
+            self.signals.failed.emit(self.generation, str(e))
+            return
+        finally:
+            if self.cleanup is not None:
+                self.cleanup()
+
+        self.signals.finished.emit(self.generation, result)